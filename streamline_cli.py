@@ -0,0 +1,4650 @@
+import click
+import json
+import os
+import pathlib
+from pathlib import Path
+import re
+import time
+import sys
+
+def error(message):
+    click.secho("error: ", fg="red", bold=True, nl=False)
+    click.secho(message)
+
+def success(message):
+    click.secho("success: ", fg="green", bold=True, nl=False)
+    click.secho(message)
+
+def info(message):
+    click.secho("info: ", fg="blue", bold=True, nl=False)
+    click.secho(message)
+
+# How much longer than a bare interpreter `streamline` may take to start, since it is run from editor hooks
+STARTUP_BUDGET = 0.1
+
+IMPORT_TIME_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \| (\s*)(\S+)$")
+
+# The thin script that is run as `streamline`, which imports this module so that its bytecode is cached
+ENTRY_POINT = Path(__file__).with_name("streamline.py")
+
+def profile_startup(context, parameter, value):
+    # Click calls this for every command, so nothing is imported until it is asked for
+    if not value or context.resilient_parsing:
+        return
+
+    import importlib.util
+    import math
+    import statistics
+    import subprocess
+
+    # Measure fresh interpreters, since this one has already paid for its imports
+    runs = 10
+    baseline_command = [sys.executable, "-X", "importtime", "-c", "pass"]
+    command = [sys.executable, "-X", "importtime", str(ENTRY_POINT.resolve()), "--help"]
+    baselines = []
+    durations = []
+    imports = {}
+
+    info(f"starting `streamline --help` {runs} times")
+
+    for _ in range(runs):
+        for measured_command, measurements in [(baseline_command, baselines), (command, durations)]:
+            start = time.perf_counter()
+            result = subprocess.run(measured_command, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+            measurements.append(time.perf_counter() - start)
+
+        # Only count the modules that are imported while running, including what they import in turn, and the loading and running of this module itself
+        children = []
+
+        for line in result.stderr.splitlines():
+            match = IMPORT_TIME_LINE.match(line)
+
+            if not match or len(match.group(3)) > 2:
+                continue
+
+            # Each import is listed after what it imports, so the modules that this one imports directly come just before it
+            if len(match.group(3)) == 2:
+                children.append((match.group(4), int(match.group(2))))
+                continue
+
+            measured = [*children, (f"{__name__} (itself)", int(match.group(1)))] if match.group(4) == __name__ else [(match.group(4), int(match.group(2)))]
+            children = []
+
+            for name, microseconds in measured:
+                imports[name] = min(imports.get(name, math.inf), microseconds / 1e6)
+
+    overhead = statistics.median(durations) - statistics.median(baselines)
+
+    for line in subprocess.run(baseline_command, stderr=subprocess.PIPE, text=True).stderr.splitlines():
+        match = IMPORT_TIME_LINE.match(line)
+
+        if match:
+            imports.pop(match.group(4), None)
+
+    click.echo()
+    info("slowest imports")
+
+    for name, seconds in sorted(imports.items(), key=lambda item: -item[1])[:10]:
+        click.echo(f"{seconds * 1000:>8.1f}ms  {name}")
+
+    # The entry point is compiled on every run, and this module only when its cached bytecode is missing or stale
+    compile_times = {}
+
+    for path in [ENTRY_POINT, Path(__file__)]:
+        source = path.read_text(encoding="utf-8")
+        start = time.perf_counter()
+        compile(source, str(path), "exec")
+        compile_times[path.name] = time.perf_counter() - start
+
+    cached_file = Path(importlib.util.cache_from_source(__file__))
+    is_cached = cached_file.exists() and cached_file.stat().st_mtime >= Path(__file__).stat().st_mtime
+
+    click.echo()
+    info("compilation")
+    click.echo(f"{compile_times[ENTRY_POINT.name] * 1000:>8.1f}ms  {ENTRY_POINT.name} (on every run)")
+    click.echo(f"{compile_times[Path(__file__).name] * 1000:>8.1f}ms  {Path(__file__).name} ({'skipped, since its bytecode is cached' if is_cached else 'on every run, since its bytecode is not cached'})")
+
+    if not is_cached:
+        error(f"could not find the cached bytecode `{cached_file}` (check that `__pycache__` is writable and that `PYTHONDONTWRITEBYTECODE` is not set)")
+
+    click.echo()
+    click.echo(f"interpreter start-up: {statistics.median(baselines) * 1000:.1f}ms")
+    click.echo(f"streamline overhead:  {overhead * 1000:.1f}ms (budget {STARTUP_BUDGET * 1000:.0f}ms)")
+    click.echo()
+
+    if overhead > STARTUP_BUDGET:
+        error("start-up is over budget")
+        context.exit(1)
+
+    success("start-up is within budget")
+    context.exit()
+
+@click.group()
+@click.option("--startup-profile", is_flag=True, is_eager=True, expose_value=False, callback=profile_startup, help="Measure how long `streamline` takes to start and which imports it spends the time on.")
+def cli():
+    pass
+
+def generate_doxyfile(project_name):
+    return f"""# Doxyfile 1.9.6
+
+#---------------------------------------------------------------------------
+# Project related configuration options
+#---------------------------------------------------------------------------
+DOXYFILE_ENCODING      = UTF-8
+PROJECT_NAME           = {project_name}
+PROJECT_NUMBER         =
+PROJECT_BRIEF          =
+PROJECT_LOGO           =
+OUTPUT_DIRECTORY       = ../docs
+CREATE_SUBDIRS         = NO
+CREATE_SUBDIRS_LEVEL   = 8
+ALLOW_UNICODE_NAMES    = NO
+OUTPUT_LANGUAGE        = English
+BRIEF_MEMBER_DESC      = YES
+REPEAT_BRIEF           = YES
+ABBREVIATE_BRIEF       = "The $name class" \
+                         "The $name widget" \
+                         "The $name file" \
+                         is \
+                         provides \
+                         specifies \
+                         contains \
+                         represents \
+                         a \
+                         an \
+                         the
+ALWAYS_DETAILED_SEC    = NO
+INLINE_INHERITED_MEMB  = NO
+FULL_PATH_NAMES        = YES
+STRIP_FROM_PATH        =
+STRIP_FROM_INC_PATH    =
+SHORT_NAMES            = NO
+JAVADOC_AUTOBRIEF      = NO
+JAVADOC_BANNER         = NO
+QT_AUTOBRIEF           = NO
+MULTILINE_CPP_IS_BRIEF = NO
+PYTHON_DOCSTRING       = YES
+INHERIT_DOCS           = YES
+SEPARATE_MEMBER_PAGES  = NO
+TAB_SIZE               = 4
+ALIASES                =
+OPTIMIZE_OUTPUT_FOR_C  = NO
+OPTIMIZE_OUTPUT_JAVA   = NO
+OPTIMIZE_FOR_FORTRAN   = NO
+OPTIMIZE_OUTPUT_VHDL   = NO
+OPTIMIZE_OUTPUT_SLICE  = NO
+EXTENSION_MAPPING      =
+MARKDOWN_SUPPORT       = YES
+TOC_INCLUDE_HEADINGS   = 5
+AUTOLINK_SUPPORT       = YES
+BUILTIN_STL_SUPPORT    = NO
+CPP_CLI_SUPPORT        = NO
+SIP_SUPPORT            = NO
+IDL_PROPERTY_SUPPORT   = YES
+DISTRIBUTE_GROUP_DOC   = NO
+GROUP_NESTED_COMPOUNDS = NO
+SUBGROUPING            = YES
+INLINE_GROUPED_CLASSES = NO
+INLINE_SIMPLE_STRUCTS  = NO
+TYPEDEF_HIDES_STRUCT   = NO
+LOOKUP_CACHE_SIZE      = 0
+NUM_PROC_THREADS       = 1
+#---------------------------------------------------------------------------
+# Build related configuration options
+#---------------------------------------------------------------------------
+EXTRACT_ALL            = NO
+EXTRACT_PRIVATE        = NO
+EXTRACT_PRIV_VIRTUAL   = NO
+EXTRACT_PACKAGE        = NO
+EXTRACT_STATIC         = NO
+EXTRACT_LOCAL_CLASSES  = YES
+EXTRACT_LOCAL_METHODS  = NO
+EXTRACT_ANON_NSPACES   = NO
+RESOLVE_UNNAMED_PARAMS = YES
+HIDE_UNDOC_MEMBERS     = NO
+HIDE_UNDOC_CLASSES     = NO
+HIDE_FRIEND_COMPOUNDS  = NO
+HIDE_IN_BODY_DOCS      = NO
+INTERNAL_DOCS          = NO
+CASE_SENSE_NAMES       = SYSTEM
+HIDE_SCOPE_NAMES       = NO
+HIDE_COMPOUND_REFERENCE= NO
+SHOW_HEADERFILE        = YES
+SHOW_INCLUDE_FILES     = YES
+SHOW_GROUPED_MEMB_INC  = NO
+FORCE_LOCAL_INCLUDES   = NO
+INLINE_INFO            = YES
+SORT_MEMBER_DOCS       = YES
+SORT_BRIEF_DOCS        = NO
+SORT_MEMBERS_CTORS_1ST = NO
+SORT_GROUP_NAMES       = NO
+SORT_BY_SCOPE_NAME     = NO
+STRICT_PROTO_MATCHING  = NO
+GENERATE_TODOLIST      = YES
+GENERATE_TESTLIST      = YES
+GENERATE_BUGLIST       = YES
+GENERATE_DEPRECATEDLIST= YES
+ENABLED_SECTIONS       =
+MAX_INITIALIZER_LINES  = 30
+SHOW_USED_FILES        = YES
+SHOW_FILES             = YES
+SHOW_NAMESPACES        = YES
+FILE_VERSION_FILTER    =
+LAYOUT_FILE            =
+CITE_BIB_FILES         =
+#---------------------------------------------------------------------------
+# Configuration options related to warning and progress messages
+#---------------------------------------------------------------------------
+QUIET                  = NO
+WARNINGS               = YES
+WARN_IF_UNDOCUMENTED   = YES
+WARN_IF_DOC_ERROR      = YES
+WARN_IF_INCOMPLETE_DOC = YES
+WARN_NO_PARAMDOC       = NO
+WARN_IF_UNDOC_ENUM_VAL = NO
+WARN_AS_ERROR          = NO
+WARN_FORMAT            = "$file:$line: $text"
+WARN_LINE_FORMAT       = "at line $line of file $file"
+WARN_LOGFILE           =
+#---------------------------------------------------------------------------
+# Configuration options related to the input files
+#---------------------------------------------------------------------------
+INPUT                  = ../src
+INPUT_ENCODING         = UTF-8
+INPUT_FILE_ENCODING    =
+FILE_PATTERNS          = *.c \
+                         *.cc \
+                         *.cxx \
+                         *.cpp \
+                         *.c++ \
+                         *.java \
+                         *.ii \
+                         *.ixx \
+                         *.ipp \
+                         *.i++ \
+                         *.inl \
+                         *.idl \
+                         *.ddl \
+                         *.odl \
+                         *.h \
+                         *.hh \
+                         *.hxx \
+                         *.hpp \
+                         *.h++ \
+                         *.l \
+                         *.cs \
+                         *.d \
+                         *.php \
+                         *.php4 \
+                         *.php5 \
+                         *.phtml \
+                         *.inc \
+                         *.m \
+                         *.markdown \
+                         *.md \
+                         *.mm \
+                         *.dox \
+                         *.py \
+                         *.pyw \
+                         *.f90 \
+                         *.f95 \
+                         *.f03 \
+                         *.f08 \
+                         *.f18 \
+                         *.f \
+                         *.for \
+                         *.vhd \
+                         *.vhdl \
+                         *.ucf \
+                         *.qsf \
+                         *.ice
+RECURSIVE              = YES
+EXCLUDE                =
+EXCLUDE_SYMLINKS       = NO
+EXCLUDE_PATTERNS       =
+EXCLUDE_SYMBOLS        =
+EXAMPLE_PATH           =
+EXAMPLE_PATTERNS       = *
+EXAMPLE_RECURSIVE      = NO
+IMAGE_PATH             =
+INPUT_FILTER           =
+FILTER_PATTERNS        =
+FILTER_SOURCE_FILES    = NO
+FILTER_SOURCE_PATTERNS =
+USE_MDFILE_AS_MAINPAGE =
+FORTRAN_COMMENT_AFTER  = 72
+#---------------------------------------------------------------------------
+# Configuration options related to source browsing
+#---------------------------------------------------------------------------
+SOURCE_BROWSER         = NO
+INLINE_SOURCES         = NO
+STRIP_CODE_COMMENTS    = YES
+REFERENCED_BY_RELATION = NO
+REFERENCES_RELATION    = NO
+REFERENCES_LINK_SOURCE = YES
+SOURCE_TOOLTIPS        = YES
+USE_HTAGS              = NO
+VERBATIM_HEADERS       = YES
+#---------------------------------------------------------------------------
+# Configuration options related to the alphabetical class index
+#---------------------------------------------------------------------------
+ALPHABETICAL_INDEX     = YES
+IGNORE_PREFIX          =
+#---------------------------------------------------------------------------
+# Configuration options related to the HTML output
+#---------------------------------------------------------------------------
+GENERATE_HTML          = YES
+HTML_OUTPUT            = html
+HTML_FILE_EXTENSION    = .html
+HTML_HEADER            =
+HTML_FOOTER            =
+HTML_STYLESHEET        =
+HTML_EXTRA_STYLESHEET  =
+HTML_EXTRA_FILES       =
+HTML_COLORSTYLE        = AUTO_LIGHT
+HTML_COLORSTYLE_HUE    = 208
+HTML_COLORSTYLE_SAT    = 217
+HTML_COLORSTYLE_GAMMA  = 56
+HTML_TIMESTAMP         = NO
+HTML_DYNAMIC_MENUS     = YES
+HTML_DYNAMIC_SECTIONS  = NO
+HTML_INDEX_NUM_ENTRIES = 100
+GENERATE_DOCSET        = NO
+DOCSET_FEEDNAME        = "Doxygen generated docs"
+DOCSET_FEEDURL         =
+DOCSET_BUNDLE_ID       = org.doxygen.Project
+DOCSET_PUBLISHER_ID    = org.doxygen.Publisher
+DOCSET_PUBLISHER_NAME  = Publisher
+GENERATE_HTMLHELP      = NO
+CHM_FILE               =
+HHC_LOCATION           =
+GENERATE_CHI           = NO
+CHM_INDEX_ENCODING     =
+BINARY_TOC             = NO
+TOC_EXPAND             = NO
+GENERATE_QHP           = NO
+QCH_FILE               =
+QHP_NAMESPACE          = org.doxygen.Project
+QHP_VIRTUAL_FOLDER     = doc
+QHP_CUST_FILTER_NAME   =
+QHP_CUST_FILTER_ATTRS  =
+QHP_SECT_FILTER_ATTRS  =
+QHG_LOCATION           =
+GENERATE_ECLIPSEHELP   = NO
+ECLIPSE_DOC_ID         = org.doxygen.Project
+DISABLE_INDEX          = NO
+GENERATE_TREEVIEW      = YES
+FULL_SIDEBAR           = NO
+ENUM_VALUES_PER_LINE   = 4
+TREEVIEW_WIDTH         = 250
+EXT_LINKS_IN_WINDOW    = NO
+OBFUSCATE_EMAILS       = YES
+HTML_FORMULA_FORMAT    = png
+FORMULA_FONTSIZE       = 10
+FORMULA_MACROFILE      =
+USE_MATHJAX            = NO
+MATHJAX_VERSION        = MathJax_2
+MATHJAX_FORMAT         = HTML-CSS
+MATHJAX_RELPATH        =
+MATHJAX_EXTENSIONS     =
+MATHJAX_CODEFILE       =
+SEARCHENGINE           = YES
+SERVER_BASED_SEARCH    = NO
+EXTERNAL_SEARCH        = NO
+SEARCHENGINE_URL       =
+SEARCHDATA_FILE        = searchdata.xml
+EXTERNAL_SEARCH_ID     =
+EXTRA_SEARCH_MAPPINGS  =
+#---------------------------------------------------------------------------
+# Configuration options related to the LaTeX output
+#---------------------------------------------------------------------------
+GENERATE_LATEX         = NO
+LATEX_OUTPUT           = latex
+LATEX_CMD_NAME         =
+MAKEINDEX_CMD_NAME     = makeindex
+LATEX_MAKEINDEX_CMD    = makeindex
+COMPACT_LATEX          = NO
+PAPER_TYPE             = a4
+EXTRA_PACKAGES         =
+LATEX_HEADER           =
+LATEX_FOOTER           =
+LATEX_EXTRA_STYLESHEET =
+LATEX_EXTRA_FILES      =
+PDF_HYPERLINKS         = YES
+USE_PDFLATEX           = YES
+LATEX_BATCHMODE        = NO
+LATEX_HIDE_INDICES     = NO
+LATEX_BIB_STYLE        = plain
+LATEX_TIMESTAMP        = NO
+LATEX_EMOJI_DIRECTORY  =
+#---------------------------------------------------------------------------
+# Configuration options related to the RTF output
+#---------------------------------------------------------------------------
+GENERATE_RTF           = NO
+RTF_OUTPUT             = rtf
+COMPACT_RTF            = NO
+RTF_HYPERLINKS         = NO
+RTF_STYLESHEET_FILE    =
+RTF_EXTENSIONS_FILE    =
+#---------------------------------------------------------------------------
+# Configuration options related to the man page output
+#---------------------------------------------------------------------------
+GENERATE_MAN           = NO
+MAN_OUTPUT             = man
+MAN_EXTENSION          = .3
+MAN_SUBDIR             =
+MAN_LINKS              = NO
+#---------------------------------------------------------------------------
+# Configuration options related to the XML output
+#---------------------------------------------------------------------------
+GENERATE_XML           = NO
+XML_OUTPUT             = xml
+XML_PROGRAMLISTING     = YES
+XML_NS_MEMB_FILE_SCOPE = NO
+#---------------------------------------------------------------------------
+# Configuration options related to the DOCBOOK output
+#---------------------------------------------------------------------------
+GENERATE_DOCBOOK       = NO
+DOCBOOK_OUTPUT         = docbook
+#---------------------------------------------------------------------------
+# Configuration options for the AutoGen Definitions output
+#---------------------------------------------------------------------------
+GENERATE_AUTOGEN_DEF   = NO
+#---------------------------------------------------------------------------
+# Configuration options related to Sqlite3 output
+#---------------------------------------------------------------------------
+#---------------------------------------------------------------------------
+# Configuration options related to the Perl module output
+#---------------------------------------------------------------------------
+GENERATE_PERLMOD       = NO
+PERLMOD_LATEX          = NO
+PERLMOD_PRETTY         = YES
+PERLMOD_MAKEVAR_PREFIX =
+#---------------------------------------------------------------------------
+# Configuration options related to the preprocessor
+#---------------------------------------------------------------------------
+ENABLE_PREPROCESSING   = YES
+MACRO_EXPANSION        = NO
+EXPAND_ONLY_PREDEF     = NO
+SEARCH_INCLUDES        = YES
+INCLUDE_PATH           =
+INCLUDE_FILE_PATTERNS  =
+PREDEFINED             =
+EXPAND_AS_DEFINED      =
+SKIP_FUNCTION_MACROS   = YES
+#---------------------------------------------------------------------------
+# Configuration options related to external references
+#---------------------------------------------------------------------------
+TAGFILES               =
+GENERATE_TAGFILE       =
+ALLEXTERNALS           = NO
+EXTERNAL_GROUPS        = YES
+EXTERNAL_PAGES         = YES
+#---------------------------------------------------------------------------
+# Configuration options related to the dot tool
+#---------------------------------------------------------------------------
+DIA_PATH               =
+HIDE_UNDOC_RELATIONS   = YES
+HAVE_DOT               = NO
+DOT_NUM_THREADS        = 0
+DOT_COMMON_ATTR        = "fontname=Helvetica,fontsize=10"
+DOT_EDGE_ATTR          = "labelfontname=Helvetica,labelfontsize=10"
+DOT_NODE_ATTR          = "shape=box,height=0.2,width=0.4"
+DOT_FONTPATH           =
+CLASS_GRAPH            = YES
+COLLABORATION_GRAPH    = YES
+GROUP_GRAPHS           = YES
+UML_LOOK               = NO
+UML_LIMIT_NUM_FIELDS   = 10
+DOT_UML_DETAILS        = NO
+DOT_WRAP_THRESHOLD     = 17
+TEMPLATE_RELATIONS     = NO
+INCLUDE_GRAPH          = YES
+INCLUDED_BY_GRAPH      = YES
+CALL_GRAPH             = NO
+CALLER_GRAPH           = NO
+GRAPHICAL_HIERARCHY    = YES
+DIRECTORY_GRAPH        = YES
+DIR_GRAPH_MAX_DEPTH    = 1
+DOT_IMAGE_FORMAT       = png
+INTERACTIVE_SVG        = NO
+DOT_PATH               =
+DOTFILE_DIRS           =
+MSCFILE_DIRS           =
+DIAFILE_DIRS           =
+PLANTUML_JAR_PATH      =
+PLANTUML_CFG_FILE      =
+PLANTUML_INCLUDE_PATH  =
+DOT_GRAPH_MAX_NODES    = 50
+MAX_DOT_GRAPH_DEPTH    = 0
+DOT_MULTI_TARGETS      = NO
+GENERATE_LEGEND        = YES
+DOT_CLEANUP            = YES"""
+
+# CMake generators that `init` can write into the build scripts
+GENERATORS = {
+    "ninja": "Ninja",
+    "make": "Unix Makefiles",
+}
+
+def find_generator():
+    import shutil
+
+    # Prefer Ninja since it builds in parallel by default, and fall back to Makefiles
+    if shutil.which("ninja") is not None:
+        return "ninja"
+
+    return "make"
+
+# Programs that can be used as `CMAKE_CXX_COMPILER_LAUNCHER`, in order of preference
+COMPILER_CACHES = ["ccache", "sccache"]
+
+def generate_compiler_cache_cmake(compiler_cache):
+    if compiler_cache == "none":
+        return ""
+
+    names = COMPILER_CACHES if compiler_cache == "auto" else [compiler_cache]
+
+    return f"""
+# Use a compiler cache when one is installed (a launcher given on the command line takes precedence)
+if(NOT CMAKE_CXX_COMPILER_LAUNCHER)
+    find_program(COMPILER_CACHE NAMES {" ".join(names)})
+
+    if(COMPILER_CACHE)
+        set(CMAKE_CXX_COMPILER_LAUNCHER "${{COMPILER_CACHE}}")
+    endif()
+endif()
+"""
+
+# Third-party dependencies pinned to a specific revision, which `streamline deps prefetch` can cache
+DEPENDENCIES = {
+    "googletest": {
+        "revision": "03597a01ee50ed33e9dfd640b249b4be3799d395",
+        "url": "https://github.com/google/googletest/archive/03597a01ee50ed33e9dfd640b249b4be3799d395.zip",
+        "package": "GTest",
+        "options": {"gtest_force_shared_crt": "ON"},
+    },
+    "benchmark": {
+        "revision": "v1.8.3",
+        "url": "https://github.com/google/benchmark/archive/refs/tags/v1.8.3.zip",
+        "package": "benchmark",
+        "options": {"BENCHMARK_ENABLE_TESTING": "OFF", "BENCHMARK_ENABLE_GTEST_TESTS": "OFF", "BENCHMARK_INSTALL_DOCS": "OFF"},
+    },
+}
+
+def find_dependency_cache():
+    if "STREAMLINE_CACHE_DIR" in os.environ:
+        return Path(os.environ["STREAMLINE_CACHE_DIR"])
+
+    return Path(os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache") / "streamline"
+
+def generate_dependency_cache_cmake():
+    return """
+# The user-level dependency cache that `streamline deps prefetch` fills
+if(DEFINED ENV{STREAMLINE_CACHE_DIR})
+    # Always follow the environment when it is set, so that changing it takes effect in existing build trees
+    set(STREAMLINE_CACHE_DIR "$ENV{STREAMLINE_CACHE_DIR}" CACHE PATH "The Streamline dependency cache." FORCE)
+else()
+    if(DEFINED ENV{XDG_CACHE_HOME})
+        set(default_cache_dir "$ENV{XDG_CACHE_HOME}/streamline")
+    else()
+        set(default_cache_dir "$ENV{HOME}/.cache/streamline")
+    endif()
+
+    set(STREAMLINE_CACHE_DIR "${default_cache_dir}" CACHE PATH "The Streamline dependency cache.")
+endif()
+"""
+
+def generate_dependency_cmake(name, edition):
+    import textwrap
+
+    dependency = DEPENDENCIES[name]
+    options = "\n".join(f'set({option} {value} CACHE BOOL "" FORCE)' for option, value in dependency["options"].items())
+
+    return f"""# Prefer a build of {name} from the dependency cache, then the cached archive, and only then the network
+set({name}_prefix "${{STREAMLINE_CACHE_DIR}}/{name}/{dependency["revision"]}/${{CMAKE_CXX_COMPILER_ID}}-${{CMAKE_CXX_COMPILER_VERSION}}-cxx{edition}")
+find_package({dependency["package"]} CONFIG QUIET PATHS "${{{name}_prefix}}" NO_DEFAULT_PATH)
+
+if(NOT {dependency["package"]}_FOUND)
+    set({name}_archive "${{STREAMLINE_CACHE_DIR}}/{name}/{dependency["revision"]}.zip")
+
+    if(NOT EXISTS "${{{name}_archive}}")
+        set({name}_archive "{dependency["url"]}")
+    endif()
+
+    cmake_policy(SET CMP0135 NEW)
+
+    include(FetchContent)
+    FetchContent_Declare({name} URL "${{{name}_archive}}")
+
+{textwrap.indent(options, "    ")}
+    FetchContent_MakeAvailable({name})
+endif()
+"""
+
+def generate_linker_cmake(linker, split_dwarf):
+    return f"""
+# The linker and debug information, which can be changed with `streamline build --linker` and `--split-dwarf`
+set(STREAMLINE_LINKER "{linker}" CACHE STRING "The linker to use: auto (mold, then lld), mold, lld or default.")
+option(STREAMLINE_SPLIT_DWARF "Split debug information out of the object files in debug builds." {"ON" if split_dwarf else "OFF"})
+
+if(STREAMLINE_LINKER STREQUAL "auto")
+    find_program(MOLD_LINKER mold)
+    find_program(LLD_LINKER ld.lld)
+
+    if(MOLD_LINKER)
+        set(linker mold)
+    elseif(LLD_LINKER)
+        set(linker lld)
+    else()
+        set(linker default)
+    endif()
+else()
+    set(linker "${{STREAMLINE_LINKER}}")
+endif()
+
+if(NOT linker STREQUAL "default")
+    if(CMAKE_VERSION VERSION_GREATER_EQUAL 3.29)
+        string(TOUPPER "${{linker}}" CMAKE_LINKER_TYPE)
+    else()
+        add_link_options("-fuse-ld=${{linker}}")
+    endif()
+endif()
+
+if(STREAMLINE_SPLIT_DWARF AND CMAKE_BUILD_TYPE MATCHES "^(Debug)?$")
+    add_compile_options(-g -gsplit-dwarf)
+
+    # The default GNU linker can't build a `.gdb_index`
+    if(NOT linker STREQUAL "default")
+        add_link_options(-Wl,--gdb-index)
+    endif()
+endif()
+"""
+
+def generate_optimization_cmake():
+    return """
+# Release tuning, set by `streamline build --release --lto --tune <arch>`
+option(STREAMLINE_LTO "Use link-time optimisation." OFF)
+set(STREAMLINE_TUNE "" CACHE STRING "The architecture to generate code for, such as native (empty for the compiler's default).")
+
+if(STREAMLINE_LTO)
+    include(CheckIPOSupported)
+    check_ipo_supported(RESULT is_ipo_supported OUTPUT ipo_output)
+
+    if(is_ipo_supported)
+        set(CMAKE_INTERPROCEDURAL_OPTIMIZATION ON)
+    else()
+        message(WARNING "Link-time optimisation is not supported: ${ipo_output}")
+    endif()
+endif()
+
+if(STREAMLINE_TUNE)
+    add_compile_options("-march=${STREAMLINE_TUNE}")
+endif()
+"""
+
+def generate_core_objects_pch_cmake():
+    return """
+    # The precompiled header is one of the objects of `core_objects`, but it mustn't be linked
+    target_precompile_headers(core_objects PRIVATE "${CMAKE_CURRENT_SOURCE_DIR}/pch.hpp")
+    target_link_libraries(core INTERFACE core_objects "$<FILTER:$<TARGET_OBJECTS:core_objects>,EXCLUDE,\\\\.(gch|pch)$>")
+"""
+
+# The build trees shared by the generated scripts and the commands that run CMake directly
+BUILD_TREES = {
+    "debug": {"directory": "build/debug", "options": [], "has_optimization_options": False},
+    "release": {"directory": "build/release", "options": ["-DCMAKE_BUILD_TYPE=Release", "-DBUILD_TESTING=OFF"], "has_optimization_options": True},
+    "bench": {"directory": "build/bench", "options": ["-DCMAKE_BUILD_TYPE=Release", "-DBUILD_TESTING=OFF", "-DSTREAMLINE_BENCH=ON"], "has_optimization_options": True},
+    "profile": {"directory": "build/profile", "options": ["-DCMAKE_BUILD_TYPE=RelWithDebInfo", "-DCMAKE_CXX_FLAGS=-fno-omit-frame-pointer"], "has_optimization_options": False},
+}
+
+def generate_build_script(generator, build_directory, targets, configure_options=(), compiler_cache="none", has_optimization_options=False):
+    configure_options = ["-G", generator, *configure_options]
+    build_command = ["cmake", "--build", build_directory, "--target", *targets, "--parallel"]
+
+    # Always pass the optimisation options so that leaving one out turns it off again
+    if has_optimization_options:
+        optimization_arguments = """parser.add_argument("--lto", action="store_true", help="Use link-time optimisation.")
+parser.add_argument("--tune", default="", help="The architecture to generate code for, such as native.")
+"""
+        optimization_options = """
+configure_options += [f"-DSTREAMLINE_LTO={'ON' if args.lto else 'OFF'}", f"-DSTREAMLINE_TUNE={args.tune}"]"""
+    else:
+        optimization_arguments = ""
+        optimization_options = ""
+
+    # Have ccache record this project's hits and misses so `streamline cache stats` can report on them
+    if compiler_cache == "none":
+        compiler_cache_environment = ""
+    else:
+        compiler_cache_environment = """
+os.environ.setdefault("CCACHE_STATSLOG", str((directory_of_script / "../build/ccache_stats.log").resolve()))
+"""
+
+    return f"""import argparse
+import hashlib
+import os
+import pathlib
+from pathlib import Path
+import shutil
+import subprocess
+import sys
+
+directory_of_script = Path(__file__).parent.resolve()
+
+parser = argparse.ArgumentParser()
+parser.add_argument("-j", "--jobs", type=int, default=os.cpu_count() or 1, help="The number of parallel build jobs.")
+parser.add_argument("--reconfigure", action="store_true", help="Run the configure step even if the existing configuration is still valid.")
+parser.add_argument("--unity", type=int, metavar="BATCH_SIZE", help="Use a unity build, combining this many sources per translation unit.")
+parser.add_argument("--no-unity", action="store_true", help="Stop using a unity build.")
+parser.add_argument("--linker", choices=["auto", "mold", "lld", "default"], help="The linker to use (auto prefers mold, then lld).")
+parser.add_argument("--split-dwarf", action="store_true", help="Split debug information out of the object files.")
+parser.add_argument("--no-split-dwarf", action="store_true", help="Keep debug information in the object files.")
+{optimization_arguments}args = parser.parse_args()
+
+configure_options = {json.dumps(configure_options)}{optimization_options}
+
+# Leave the unity setting in the build tree alone unless it is asked to change
+if args.unity is not None:
+    configure_options += ["-DCMAKE_UNITY_BUILD=ON", f"-DCMAKE_UNITY_BUILD_BATCH_SIZE={{args.unity}}"]
+elif args.no_unity:
+    configure_options.append("-DCMAKE_UNITY_BUILD=OFF")
+
+if args.linker is not None:
+    configure_options.append(f"-DSTREAMLINE_LINKER={{args.linker}}")
+
+if args.split_dwarf or args.no_split_dwarf:
+    configure_options.append(f"-DSTREAMLINE_SPLIT_DWARF={{'ON' if args.split_dwarf else 'OFF'}}")
+
+configure_command = ["cmake", *configure_options, "-S", "..", "-B", "{build_directory}"]
+source_directory = directory_of_script / ".."
+build_directory = directory_of_script / "{build_directory}"
+fingerprint_file = build_directory / "streamline_fingerprint.txt"
+{compiler_cache_environment}
+def fingerprint():
+    # Anything that changes the result of configuring: the CMake files, the options, and the toolchain
+    digest = hashlib.sha256()
+    digest.update(repr(configure_options).encode())
+    digest.update(str(shutil.which("cmake")).encode())
+
+    for variable in ["CC", "CXX", "CFLAGS", "CXXFLAGS", "LDFLAGS", "CMAKE_TOOLCHAIN_FILE", "STREAMLINE_CACHE_DIR"]:
+        digest.update(f"{{variable}}={{os.environ.get(variable, '')}}\\n".encode())
+
+    for cmake_file in sorted([*source_directory.glob("CMakeLists.txt"), *source_directory.glob("*/CMakeLists.txt"), *source_directory.glob("*.cmake")]):
+        digest.update(str(cmake_file.relative_to(source_directory)).encode())
+        digest.update(cmake_file.read_bytes())
+
+    return digest.hexdigest()
+
+current_fingerprint = fingerprint()
+is_configured = (build_directory / "CMakeCache.txt").exists() and fingerprint_file.exists() and fingerprint_file.read_text() == current_fingerprint
+
+if args.reconfigure or not is_configured:
+    exit_code = subprocess.call(configure_command, cwd=directory_of_script)
+
+    if exit_code != 0:
+        sys.exit(exit_code)
+
+    fingerprint_file.write_text(current_fingerprint)
+
+sys.exit(subprocess.call([*{json.dumps(build_command)}, str(args.jobs)], cwd=directory_of_script))
+"""
+
+def generate_config(name, edition, generator, tests, docs, bench, pch, linker, split_dwarf, compiler_cache):
+    return f"""# How Streamline builds this project. The scripts in `tools` do the same steps when run by hand.
+name = "{name}"
+edition = "{edition}"
+generator = "{generator}"
+tests = "{tests}"
+docs = "{docs}"
+bench = "{bench}"
+pch = {"true" if pch else "false"}
+linker = "{linker}"
+split_dwarf = {"true" if split_dwarf else "false"}
+compiler_cache = "{compiler_cache}"
+"""
+
+DEFAULT_CONFIG = {
+    "name": "",
+    "edition": "17",
+    "generator": "make",
+    "tests": "none",
+    "docs": "none",
+    "bench": "none",
+    "pch": False,
+    "linker": "auto",
+    "split_dwarf": False,
+    "compiler_cache": "none",
+}
+
+def read_config(project_directory="."):
+    # Without `streamline.toml`, or without a TOML parser, commands fall back to the scripts in `tools`
+    config_file = Path(project_directory) / "streamline.toml"
+
+    if not config_file.exists():
+        return None
+
+    try:
+        import tomllib
+    except ImportError:
+        try:
+            import tomli as tomllib
+        except ImportError:
+            return None
+
+    try:
+        with config_file.open("rb") as f:
+            config = tomllib.load(f)
+    except (OSError, tomllib.TOMLDecodeError) as e:
+        error(f"could not read `streamline.toml` ({e}), falling back to the scripts in `./tools`")
+        return None
+
+    return {**DEFAULT_CONFIG, **config}
+
+def settings_arguments(settings):
+    # Settings that stay in the build tree, passed to the generated scripts
+    settings = settings or {}
+    arguments = []
+
+    if settings.get("unity") is not None:
+        arguments += ["--unity", str(settings["unity"])]
+    elif settings.get("no_unity"):
+        arguments.append("--no-unity")
+
+    if settings.get("linker") is not None:
+        arguments += ["--linker", settings["linker"]]
+
+    if settings.get("split_dwarf") is not None:
+        arguments.append("--split-dwarf" if settings["split_dwarf"] else "--no-split-dwarf")
+
+    return arguments
+
+def settings_options(settings):
+    # The same settings as CMake options, in the order that the generated scripts add them
+    settings = settings or {}
+    options = []
+
+    if settings.get("unity") is not None:
+        options += ["-DCMAKE_UNITY_BUILD=ON", f"-DCMAKE_UNITY_BUILD_BATCH_SIZE={settings['unity']}"]
+    elif settings.get("no_unity"):
+        options.append("-DCMAKE_UNITY_BUILD=OFF")
+
+    if settings.get("linker") is not None:
+        options.append(f"-DSTREAMLINE_LINKER={settings['linker']}")
+
+    if settings.get("split_dwarf") is not None:
+        options.append(f"-DSTREAMLINE_SPLIT_DWARF={'ON' if settings['split_dwarf'] else 'OFF'}")
+
+    return options
+
+def configure_fingerprint(configure_options):
+    import hashlib
+    import shutil
+
+    # Matches `fingerprint()` in the generated scripts, so that both can share a build tree without reconfiguring
+    digest = hashlib.sha256()
+    digest.update(repr(configure_options).encode())
+    digest.update(str(shutil.which("cmake")).encode())
+
+    for variable in ["CC", "CXX", "CFLAGS", "CXXFLAGS", "LDFLAGS", "CMAKE_TOOLCHAIN_FILE", "STREAMLINE_CACHE_DIR"]:
+        digest.update(f"{variable}={os.environ.get(variable, '')}\n".encode())
+
+    for cmake_file in sorted([*Path(".").glob("CMakeLists.txt"), *Path(".").glob("*/CMakeLists.txt"), *Path(".").glob("*.cmake")]):
+        digest.update(str(cmake_file).encode())
+        digest.update(cmake_file.read_bytes())
+
+    return digest.hexdigest()
+
+SOURCE_DIRECTORIES = ["src", "tests", "bench"]
+
+def generate_sources_cmake(sources):
+    listed_sources = "".join(f'    "{source}"\n' for source in sources)
+
+    return f"""# The sources to build, kept up to date by `streamline add`, `streamline sync`, and `streamline build`
+set(sources
+{listed_sources})
+"""
+
+def find_sources(directory):
+    # Only `src/main.cpp` is left out, since it is built into `out` on its own
+    sources = (path.relative_to(directory).as_posix() for path in Path(directory).rglob("*.cpp"))
+
+    return sorted(source for source in sources if not (Path(directory).name == "src" and source == "main.cpp"))
+
+def read_sources(manifest):
+    return re.findall(r'^\s*"([^"]*)"', manifest.read_text(encoding="utf-8"), re.MULTILINE)
+
+def sync_sources(force=False):
+    manifests = [Path(directory) / "sources.cmake" for directory in SOURCE_DIRECTORIES if (Path(directory) / "sources.cmake").exists()]
+    state_file = Path("build") / "streamline_sources.json"
+    changes = []
+
+    if not manifests:
+        return changes
+
+    try:
+        state = json.loads(state_file.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        state = {}
+
+    # Files can only have appeared or vanished where a directory's modification time has changed, so there is no need to walk the tree otherwise
+    def is_unchanged(directory, modification_time):
+        try:
+            return os.stat(directory).st_mtime_ns == modification_time
+        except OSError:
+            return False
+
+    if not force and state and all(is_unchanged(directory, modification_time) for directory, modification_time in state.items()):
+        return changes
+
+    for manifest in manifests:
+        listed_sources = read_sources(manifest)
+        sources = find_sources(manifest.parent)
+
+        # Rewriting an unchanged list would make CMake reconfigure for nothing
+        if sources != listed_sources:
+            manifest.write_text(generate_sources_cmake(sources), encoding="utf-8")
+
+            changes += [f"+ {manifest.parent.as_posix()}/{source}" for source in sources if source not in listed_sources]
+            changes += [f"- {manifest.parent.as_posix()}/{source}" for source in listed_sources if source not in sources]
+
+    state = {root: os.stat(root).st_mtime_ns for manifest in manifests for root, _, _ in os.walk(manifest.parent)}
+    state_file.parent.mkdir(exist_ok=True)
+    state_file.write_text(json.dumps(state), encoding="utf-8")
+
+    return changes
+
+def update_source_lists():
+    # Pick up sources that have been added or removed since the last build
+    changes = sync_sources()
+
+    if changes:
+        info(f"updated the source lists: {', '.join(changes)}")
+
+    return changes
+
+def build_tree(config, tree, targets, jobs=None, options=(), call=None, sync=True):
+    import subprocess
+
+    call = call or subprocess.call
+
+    # Builds that run at the same time leave this to their caller, so that they don't race to rewrite the source lists
+    if sync:
+        update_source_lists()
+
+    # Configure (only when something that affects the configuration has changed) and build, like the generated scripts
+    build_directory = Path(BUILD_TREES[tree]["directory"])
+    fingerprint_file = build_directory / "streamline_fingerprint.txt"
+    configure_options = ["-G", GENERATORS[config["generator"]], *BUILD_TREES[tree]["options"], *options]
+
+    if config["compiler_cache"] != "none":
+        os.environ.setdefault("CCACHE_STATSLOG", str((Path("build") / "ccache_stats.log").resolve()))
+
+    current_fingerprint = configure_fingerprint(configure_options)
+    is_configured = (build_directory / "CMakeCache.txt").exists() and fingerprint_file.exists() and fingerprint_file.read_text() == current_fingerprint
+
+    if not is_configured:
+        exit_code = call(["cmake", *configure_options, "-S", ".", "-B", build_directory])
+
+        if exit_code != 0:
+            return exit_code
+
+        fingerprint_file.write_text(current_fingerprint)
+
+    return call(["cmake", "--build", build_directory, "--target", *targets, "--parallel", str(jobs or os.cpu_count() or 1)])
+
+@cli.command()
+@click.option("--name", help="The name of the project (defaults to the name of the current directory).")
+@click.option("--edition", type=click.Choice(["98", "11", "14", "17", "20", "23", "26"]), default="17", help="The edition (version) of C++ to use.")
+@click.option("--docs", type=click.Choice(["none", "doxygen"]), help="The documentation generator to use.")
+@click.option("--tests", type=click.Choice(["none", "gtest"]), help="The testing framework to use.")
+@click.option("--bench", type=click.Choice(["none", "gbench"]), help="The benchmarking framework to use.")
+@click.option("--pch", is_flag=True, help="Whether to use a precompiled header (`src/pch.hpp`).")
+@click.option("--linker", type=click.Choice(["auto", "mold", "lld", "default"]), default="auto", help="The linker to use (auto prefers mold, then lld, when they are installed).")
+@click.option("--split-dwarf", is_flag=True, help="Whether debug builds split their debug information out of the object files.")
+@click.option("--generator", type=click.Choice(["auto", "ninja", "make"]), default="auto", help="The CMake generator to use (auto prefers Ninja when it is installed).")
+@click.option("--compiler-cache", type=click.Choice(["auto", "ccache", "sccache", "none"]), default="auto", help="The compiler cache to use when it is installed (auto prefers ccache).")
+def init(name, edition, docs, tests, bench, pch, linker, split_dwarf, generator, compiler_cache):
+    import textwrap
+
+    # Resolve the default name here rather than when the module is imported
+    if name is None:
+        name = Path.cwd().name
+
+    # Check that the project name is valid
+    valid_characters = [c for c in name if c.islower() or c.isdigit() or c=='-' or c=='_']
+
+    if len(valid_characters) != len(name):
+        error("project names can only contain alphanumeric characters, hyphens, and underscores")
+        return
+
+    # Check if the current directory is empty
+    current_directory = Path(".")
+
+    if any(current_directory.glob("*")):
+        error(f"destination `{current_directory.resolve()}` is not empty")
+        return
+
+    if generator == "auto":
+        generator = find_generator()
+
+    # Create `streamline.toml`
+    with (current_directory / "streamline.toml").open("w", encoding="utf-8") as f:
+        f.writelines(generate_config(name, edition, generator, tests or "none", docs or "none", bench or "none", pch, linker, split_dwarf, compiler_cache))
+
+    # Populate via the Pitchfork Layout
+    src_directory = Path(current_directory, "src")
+    tools_directory = Path(current_directory, "tools")
+
+    src_directory.mkdir() # Source code / header files
+    Path(current_directory, "external").mkdir() # Hold third-party libraries
+    Path(current_directory, "data").mkdir() # Hold non-code files
+    tools_directory.mkdir() # Hold scripts for project management (e.g. build, test, docs)
+    tests_directory = Path(current_directory, "tests")
+
+    if tests != "none":
+        if tests == "gtest":
+            tests_directory.mkdir() # Hold test files
+
+    bench_directory = Path(current_directory, "bench")
+
+    if bench == "gbench":
+        bench_directory.mkdir() # Hold benchmarks
+
+    if docs != "none":
+        if docs == "doxygen":
+            with (tools_directory / "Doxyfile").open("w", encoding="utf-8") as f:
+                f.writelines(generate_doxyfile(name))
+
+    # Create `main.cpp`
+    with (src_directory / "main.cpp").open("w", encoding="utf-8") as f:
+        f.writelines("""#include <iostream>
+
+int
+main() {
+    std::cout << "Hello, world!\\n";
+    std::cout << "Goodbye, cruel world!\\n";
+    
+    return 0;
+}
+""")
+
+    # Create `pch.hpp`
+    if pch:
+        with (src_directory / "pch.hpp").open("w", encoding="utf-8") as f:
+            f.writelines("""// Headers that are included by many files and rarely change, compiled once for the whole project
+#pragma once
+
+#include <algorithm>
+#include <iostream>
+#include <map>
+#include <memory>
+#include <string>
+#include <unordered_map>
+#include <utility>
+#include <vector>
+""")
+
+    # Create the source lists that CMake includes, rather than globbing the directories on every build
+    for directory in [src_directory, tests_directory, bench_directory]:
+        if directory.exists():
+            with (directory / "sources.cmake").open("w", encoding="utf-8") as f:
+                f.writelines(generate_sources_cmake(find_sources(directory)))
+
+    # Create `CMakeLists.txt`
+    with (current_directory / "CMakeLists.txt").open("w", encoding="utf-8") as f:
+        f.writelines(f"""cmake_minimum_required(VERSION 3.24)
+
+project({name} VERSION 1.0
+             LANGUAGES CXX)
+{generate_compiler_cache_cmake(compiler_cache)}{generate_linker_cmake(linker, split_dwarf)}{generate_optimization_cmake()}{generate_dependency_cache_cmake() if tests == "gtest" or bench == "gbench" else ""}
+add_subdirectory(src)
+""")
+
+        if tests == "gtest":
+            f.writelines("""
+option(BUILD_TESTING "Build the tests." ON)
+
+if(BUILD_TESTING)
+    enable_testing()
+    add_subdirectory(tests)
+endif()
+""")
+
+        if bench == "gbench":
+            f.writelines("""
+option(STREAMLINE_BENCH "Build the benchmarks." OFF)
+
+if(STREAMLINE_BENCH)
+    add_subdirectory(bench)
+endif()
+""")
+
+    # Create `src/CMakeLists.txt`
+    with (src_directory / "CMakeLists.txt").open("w", encoding="utf-8") as f:
+        f.writelines(f"""include("${{CMAKE_CURRENT_SOURCE_DIR}}/sources.cmake")
+
+# Everything except `main.cpp` is compiled once and shared by `out` and `test_runner`
+add_library(core INTERFACE)
+target_include_directories(core INTERFACE "${{CMAKE_CURRENT_SOURCE_DIR}}")
+
+if(sources)
+    add_library(core_objects OBJECT ${{sources}})
+
+    set_target_properties(core_objects PROPERTIES
+        CXX_STANDARD {edition}
+        CXX_STANDARD_REQUIRED YES
+        CXX_EXTENSIONS NO
+    )
+
+    target_include_directories(core_objects PUBLIC "${{CMAKE_CURRENT_SOURCE_DIR}}")
+{generate_core_objects_pch_cmake() if pch else "    target_link_libraries(core INTERFACE core_objects $<TARGET_OBJECTS:core_objects>)" + chr(10)}endif()
+
+add_executable(out main.cpp)
+
+set_target_properties(out PROPERTIES
+    CXX_STANDARD {edition}
+    CXX_STANDARD_REQUIRED YES
+    CXX_EXTENSIONS NO
+    RUNTIME_OUTPUT_DIRECTORY "${{CMAKE_BINARY_DIR}}"
+)
+
+target_link_libraries(out PRIVATE core)
+""")
+
+        if pch:
+            f.writelines("""
+# `out` reuses the precompiled header of the shared sources rather than building its own, unless `main.cpp` is the only source
+if(TARGET core_objects)
+    target_precompile_headers(out REUSE_FROM core_objects)
+else()
+    target_precompile_headers(out PRIVATE "${CMAKE_CURRENT_SOURCE_DIR}/pch.hpp")
+endif()
+""")
+
+    # Create `tests/CMakeLists.txt`
+    if tests == "gtest":
+        with (tests_directory / "CMakeLists.txt").open("w", encoding="utf-8") as f:
+            f.writelines(f"""include("${{CMAKE_CURRENT_SOURCE_DIR}}/sources.cmake")
+
+# Only fetch Google Test once there are tests to build
+if(sources)
+{textwrap.indent(generate_dependency_cmake("googletest", edition), "    ")}
+    add_executable(test_runner ${{sources}})
+
+    set_target_properties(test_runner PROPERTIES
+        CXX_STANDARD {edition}
+        CXX_STANDARD_REQUIRED YES
+        CXX_EXTENSIONS NO
+        RUNTIME_OUTPUT_DIRECTORY "${{CMAKE_BINARY_DIR}}"
+    )
+
+    target_link_libraries(test_runner PRIVATE core GTest::gtest_main)
+{'    target_precompile_headers(test_runner PRIVATE <gtest/gtest.h> "${PROJECT_SOURCE_DIR}/src/pch.hpp")' + chr(10) if pch else ""}
+    include(GoogleTest)
+    gtest_discover_tests(test_runner)
+else()
+    # A placeholder until tests are added to `sources.cmake`, which reconfigures the build when it changes
+    add_custom_target(test_runner COMMAND "${{CMAKE_COMMAND}}" -E echo "No tests found in ${{CMAKE_CURRENT_SOURCE_DIR}}")
+endif()
+""")
+
+    # Create `bench/CMakeLists.txt`
+    if bench == "gbench":
+        with (bench_directory / "CMakeLists.txt").open("w", encoding="utf-8") as f:
+            f.writelines(f"""include("${{CMAKE_CURRENT_SOURCE_DIR}}/sources.cmake")
+
+# Only fetch Google Benchmark once there are benchmarks to build
+if(sources)
+{textwrap.indent(generate_dependency_cmake("benchmark", edition), "    ")}
+    add_executable(bench_runner ${{sources}})
+
+    set_target_properties(bench_runner PROPERTIES
+        CXX_STANDARD {edition}
+        CXX_STANDARD_REQUIRED YES
+        CXX_EXTENSIONS NO
+        RUNTIME_OUTPUT_DIRECTORY "${{CMAKE_BINARY_DIR}}"
+    )
+
+    target_link_libraries(bench_runner PRIVATE core benchmark::benchmark_main)
+{'    target_precompile_headers(bench_runner PRIVATE <benchmark/benchmark.h> "${PROJECT_SOURCE_DIR}/src/pch.hpp")' + chr(10) if pch else ""}else()
+    # A placeholder until benchmarks are added to `sources.cmake`, which reconfigures the build when it changes
+    add_custom_target(bench_runner COMMAND "${{CMAKE_COMMAND}}" -E echo "No benchmarks found in ${{CMAKE_CURRENT_SOURCE_DIR}}")
+endif()
+""")
+
+    # Create `build_debug.py`
+    with (tools_directory / "build_debug.py").open("w", encoding="utf-8") as f:
+        f.writelines(generate_build_script(GENERATORS[generator], "../build/debug", ["out"], BUILD_TREES["debug"]["options"], compiler_cache=compiler_cache))
+
+    # Create `build_release.py`
+    with (tools_directory / "build_release.py").open("w", encoding="utf-8") as f:
+        f.writelines(generate_build_script(GENERATORS[generator], "../build/release", ["out"], BUILD_TREES["release"]["options"], compiler_cache=compiler_cache, has_optimization_options=True))
+
+    # Create `build_docs.py`
+    if docs == "doxygen":
+        with (tools_directory / "build_docs.py").open("w", encoding="utf-8") as f:
+            f.writelines("""import argparse
+import os
+import pathlib
+from pathlib import Path
+import subprocess
+import sys
+
+directory_of_script = Path(__file__).parent.resolve()
+
+parser = argparse.ArgumentParser()
+parser.add_argument("-j", "--jobs", type=int, default=os.cpu_count() or 1, help="The number of threads for Doxygen to use.")
+args = parser.parse_args()
+
+# Pass the Doxyfile on stdin so that the thread count can be set without editing it
+doxyfile = (directory_of_script / "Doxyfile").read_text(encoding="utf-8")
+
+sys.exit(subprocess.run(["doxygen", "-q", "-"], input=f"{doxyfile}\\nNUM_PROC_THREADS = {args.jobs}\\n", text=True, cwd=directory_of_script).returncode)
+""")
+
+    # Create `run.py`
+    with (tools_directory / "run.py").open("w", encoding="utf-8") as f:
+        f.writelines("""import pathlib
+from pathlib import Path
+import subprocess
+import sys
+
+directory_of_script = Path(__file__).parent.resolve()
+
+sys.exit(subprocess.call(["../build/debug/out", *sys.argv[1:]], cwd=directory_of_script))
+""")
+
+    # Create `build_tests.py`
+    if tests == "gtest":
+        with (tools_directory / "build_tests.py").open("w", encoding="utf-8") as f:
+            f.writelines(generate_build_script(GENERATORS[generator], "../build/debug", ["test_runner"], BUILD_TREES["debug"]["options"], compiler_cache=compiler_cache))
+
+    # Create `test.py`
+    if tests == "gtest":
+        with (tools_directory / "test.py").open("w", encoding="utf-8") as f:
+            f.writelines("""import argparse
+import os
+import pathlib
+from pathlib import Path
+import subprocess
+import sys
+
+directory_of_script = Path(__file__).parent.resolve()
+
+parser = argparse.ArgumentParser()
+parser.add_argument("-j", "--jobs", type=int, default=os.cpu_count() or 1, help="The number of tests to run in parallel.")
+parser.add_argument("--filter", help="Only run the tests whose names match this regular expression.")
+parser.add_argument("--repeat", type=int, default=1, help="Run each test up to this many times, stopping at its first failure.")
+args = parser.parse_args()
+
+# The tests are registered with CTest by `gtest_discover_tests`, so CTest can run them in parallel
+command = ["ctest", "--test-dir", "../build/debug", "--output-on-failure", "--parallel", str(args.jobs)]
+
+if args.filter is not None:
+    command += ["--tests-regex", args.filter]
+
+if args.repeat > 1:
+    command += ["--repeat", f"until-fail:{args.repeat}"]
+
+sys.exit(subprocess.call(command, cwd=directory_of_script))
+""")
+
+    # Create `build_bench.py`
+    if bench == "gbench":
+        with (tools_directory / "build_bench.py").open("w", encoding="utf-8") as f:
+            f.writelines(generate_build_script(GENERATORS[generator], "../build/bench", ["bench_runner"], BUILD_TREES["bench"]["options"], compiler_cache=compiler_cache, has_optimization_options=True))
+
+    # Create `bench.py`
+    if bench == "gbench":
+        with (tools_directory / "bench.py").open("w", encoding="utf-8") as f:
+            f.writelines("""import argparse
+import pathlib
+from pathlib import Path
+import subprocess
+import sys
+
+directory_of_script = Path(__file__).parent.resolve()
+
+parser = argparse.ArgumentParser()
+parser.add_argument("--filter", help="Only run the benchmarks whose names match this regular expression.")
+parser.add_argument("--repetitions", type=int, default=10, help="The number of times to repeat each benchmark.")
+parser.add_argument("--out", default="../build/bench/results.json", help="Where to write the results as JSON.")
+args = parser.parse_args()
+
+command = ["../build/bench/bench_runner", f"--benchmark_repetitions={args.repetitions}", f"--benchmark_out={args.out}", "--benchmark_out_format=json"]
+
+if args.filter is not None:
+    command.append(f"--benchmark_filter={args.filter}")
+
+sys.exit(subprocess.call(command, cwd=directory_of_script))
+""")
+
+    # Create `.gitignore`
+    with (current_directory / ".gitignore").open("w", encoding="utf-8") as f:
+        f.writelines("""build""")
+
+    success("created new project")
+
+@cli.command()
+@click.argument("files", nargs=-1, required=True, type=click.Path(dir_okay=False))
+def add(files):
+    for file in files:
+        path = Path(file).resolve()
+        directory = next((Path(directory).resolve() for directory in SOURCE_DIRECTORIES if Path(directory).resolve() in path.parents), None)
+
+        # Check that the file belongs to a directory with a source list
+        if directory is None:
+            error(f"`{file}` is not in `./src`, `./tests`, or `./bench`")
+            sys.exit(1)
+
+        manifest = directory / "sources.cmake"
+
+        if not manifest.exists():
+            error(f"could not find `{directory.name}/sources.cmake` (run `streamline sync` to create it)")
+            sys.exit(1)
+
+        if not path.exists():
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.touch()
+
+            success(f"created `{file}`")
+
+        # Headers are found through the include directories, so only sources are listed
+        source = path.relative_to(directory).as_posix()
+
+        if path.suffix != ".cpp" or (directory.name == "src" and source == "main.cpp"):
+            continue
+
+        sources = read_sources(manifest)
+
+        if source in sources:
+            info(f"`{file}` is already in `{directory.name}/sources.cmake`")
+            continue
+
+        manifest.write_text(generate_sources_cmake(sorted([*sources, source])), encoding="utf-8")
+
+        success(f"added `{file}` to `{directory.name}/sources.cmake`")
+
+@cli.command()
+def sync():
+    import textwrap
+
+    # Move projects made before source lists existed, whose `src` and `tests` are separate CMake projects that glob their sources, over to source lists
+    migrations = {
+        "src": [
+            (r'file\(GLOB_RECURSE sources CONFIGURE_DEPENDS "\*\.cpp"\)\n', 'include("${CMAKE_CURRENT_SOURCE_DIR}/sources.cmake")\n'),
+            (r"add_executable\(out \$\{sources\}\)", "add_executable(out main.cpp ${sources})"),
+        ],
+        "tests": [
+            (r'( *)file\(GLOB_RECURSE sources CONFIGURE_DEPENDS "\*\.cpp" "\.\./src/\*\.cpp"\)\n *list\(FILTER sources EXCLUDE REGEX "main\.cpp"\)\n', lambda match: textwrap.indent("""# The tests are built with everything in `src` except `main.cpp`
+include("${CMAKE_CURRENT_SOURCE_DIR}/../src/sources.cmake")
+list(TRANSFORM sources PREPEND "${CMAKE_CURRENT_SOURCE_DIR}/../src/")
+set(src_sources ${sources})
+include("${CMAKE_CURRENT_SOURCE_DIR}/sources.cmake")
+list(APPEND sources ${src_sources})
+""", match.group(1))),
+        ],
+    }
+
+    for directory, substitutions in migrations.items():
+        cmake_file = Path(directory) / "CMakeLists.txt"
+
+        text = cmake_file.read_text(encoding="utf-8") if cmake_file.exists() else ""
+
+        if not re.search(substitutions[0][0], text):
+            continue
+
+        for pattern, replacement in substitutions:
+            text = re.sub(pattern, replacement, text)
+
+        (Path(directory) / "sources.cmake").write_text(generate_sources_cmake([]), encoding="utf-8")
+        cmake_file.write_text(text, encoding="utf-8")
+
+        info(f"`{cmake_file.as_posix()}` now includes `sources.cmake` instead of globbing its sources")
+
+    if not any((Path(directory) / "sources.cmake").exists() for directory in SOURCE_DIRECTORIES):
+        error("could not find any source lists, or CMake files that glob their sources")
+        sys.exit(1)
+
+    for change in sync_sources(force=True):
+        click.echo(f"  {change}")
+
+    success("the source lists are up to date")
+
+def log_file():
+    return Path("build") / "streamline_log.jsonl"
+
+def is_target_object(path):
+    # Targets keep their objects in `CMakeFiles/<target>.dir`, whereas CMake's own checks compile in other directories under `CMakeFiles`, like `CMakeFiles/_CMakeLTOTest-CXX`
+    parts = path.parts
+
+    if "CMakeFiles" not in parts:
+        return False
+
+    index = parts.index("CMakeFiles")
+
+    return index + 1 < len(parts) and parts[index + 1].endswith(".dir")
+
+def measure_build(build_directory, start):
+    build_directory = Path(build_directory)
+    measurements = {"configure": None, "compile": None, "link": None, "translation_units": 0}
+
+    # The build scripts only rewrite the fingerprint after they have had to configure
+    fingerprint_file = build_directory / "streamline_fingerprint.txt"
+    configure_end = start
+
+    if fingerprint_file.exists() and fingerprint_file.stat().st_mtime >= start:
+        configure_end = fingerprint_file.stat().st_mtime
+        measurements["configure"] = configure_end - start
+
+    # Approximate compile and link time from when the object files and executables were written, which works for every generator
+    objects = [path.stat().st_mtime for path in build_directory.rglob("*") if path.suffix in [".o", ".obj"] and is_target_object(path.relative_to(build_directory)) and path.stat().st_mtime >= start]
+    executables = [path.stat().st_mtime for path in [build_directory / "out", build_directory / "test_runner"] if path.exists() and path.stat().st_mtime >= start]
+    compile_end = max(objects, default=configure_end)
+
+    measurements["translation_units"] = len(objects)
+
+    if objects:
+        measurements["compile"] = compile_end - configure_end
+
+    if executables:
+        measurements["link"] = max(executables) - compile_end
+
+    return measurements
+
+def run_timed(command, phase, build_directory=None):
+    import subprocess
+
+    # `command` is either a command line or a function that runs the step and returns its exit code
+    start = time.time()
+    exit_code = command() if callable(command) else subprocess.call(command)
+
+    record = {
+        "time": start,
+        "command": click.get_current_context().info_name,
+        "phase": phase,
+        "duration": time.time() - start,
+        "exit_code": exit_code,
+    }
+
+    if build_directory is not None:
+        record.update(measure_build(build_directory, start))
+
+    write_log_record(record)
+
+    return exit_code
+
+def write_log_record(record):
+    log_file().parent.mkdir(exist_ok=True)
+
+    with log_file().open("a", encoding="utf-8") as f:
+        f.write(json.dumps(record) + "\n")
+
+def jobs_option(function):
+    return click.option("-j", "--jobs", type=click.IntRange(min=1), help="The number of parallel build jobs (defaults to the number of cores).")(function)
+
+def jobs_arguments(jobs):
+    # Leave the default to the generated scripts so that they behave the same when run directly
+    if jobs is None:
+        return []
+
+    return ["--jobs", str(jobs)]
+
+BUILD_CONFIGS = ["debug", "release", "tests"]
+
+def parse_configs(context, parameter, value):
+    if value is None:
+        return None
+
+    configs = [name.strip() for name in value.split(",") if name.strip()]
+
+    for name in configs:
+        if name not in BUILD_CONFIGS:
+            raise click.BadParameter(f"`{name}` is not one of {', '.join(BUILD_CONFIGS)}")
+
+    return configs
+
+@cli.command()
+@click.option("--debug/--release", default=True)
+@jobs_option
+@click.option("--all", "all_configs", is_flag=True, help="Build the debug, release, and test configurations at the same time.")
+@click.option("--configs", callback=parse_configs, help="Build these configurations at the same time, such as debug,release,tests.")
+@click.option("--profile-compile", is_flag=True, help="Rebuild everything in `build/profile-compile` and report where the compile time goes.")
+@click.option("--top", type=click.IntRange(min=1), default=10, help="The number of entries to show in each part of the compile-time report.")
+@click.option("--lto", is_flag=True, help="Use link-time optimisation (release builds only).")
+@click.option("--tune", help="The architecture to generate code for, such as native (release builds only).")
+@click.option("--unity", type=click.IntRange(min=1), is_flag=False, flag_value=8, help="Use a unity build, combining BATCH_SIZE sources per translation unit (8 if no size is given).", metavar="[BATCH_SIZE]")
+@click.option("--no-unity", is_flag=True, help="Stop using a unity build.")
+@click.option("--linker", type=click.Choice(["auto", "mold", "lld", "default"]), help="The linker to use from now on (auto prefers mold, then lld).")
+@click.option("--split-dwarf/--no-split-dwarf", default=None, help="Whether debug builds split their debug information out of the object files from now on.")
+def build(debug, jobs, all_configs, configs, profile_compile, top, lto, tune, unity, no_unity, linker, split_dwarf):
+    # These settings stay in the build tree, so they are only passed on when they are given
+    settings = {"unity": unity, "no_unity": no_unity, "linker": linker, "split_dwarf": split_dwarf}
+
+    if all_configs or configs:
+        if profile_compile:
+            error("`--profile-compile` cannot be combined with `--all` or `--configs`")
+            sys.exit(1)
+
+        configs = configs or [name for name in BUILD_CONFIGS if name != "tests" or has_tests()]
+
+        if (lto or tune) and "release" not in configs:
+            error("`--lto` and `--tune` only apply to release builds (add `release` to `--configs`)")
+            sys.exit(1)
+
+        sys.exit(run_parallel_builds(configs, jobs, lto, tune, settings))
+
+    if debug and (lto or tune):
+        error("`--lto` and `--tune` only apply to release builds (add `--release`)")
+        sys.exit(1)
+
+    if profile_compile:
+        if not run_profile_compile(jobs, top):
+            sys.exit(1)
+    elif debug:
+        exit_code = run_debug_build(jobs, settings)
+    else:
+        exit_code = run_release_build(jobs, lto, tune, settings)
+
+    if not profile_compile and exit_code != 0:
+        sys.exit(exit_code)
+
+def manifest_file():
+    return Path("build/debug") / "streamline_manifest.json"
+
+def debug_build_inputs():
+    # Everything that `out` is built from, including the script that decides how it is configured
+    inputs = [path for path in [Path("CMakeLists.txt"), Path("streamline.toml"), Path("tools/build_debug.py")] if path.exists()]
+    inputs += sorted(Path(".").glob("*.cmake"))
+    inputs += sorted(path for path in Path("src").rglob("*") if path.is_file())
+
+    return inputs
+
+def hash_file(path):
+    import hashlib
+
+    return hashlib.sha256(path.read_bytes()).hexdigest()
+
+def read_manifest():
+    try:
+        return json.loads(manifest_file().read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+
+def snapshot_debug_build_inputs(previous=None):
+    previous_files = (previous or {}).get("files", {})
+    files = {}
+
+    for path in debug_build_inputs():
+        stat = path.stat()
+        entry = previous_files.get(path.as_posix())
+
+        # Only hash files whose modification time or size has changed since the last manifest
+        if entry is not None and entry[:2] == [stat.st_mtime_ns, stat.st_size]:
+            files[path.as_posix()] = entry
+        else:
+            files[path.as_posix()] = [stat.st_mtime_ns, stat.st_size, hash_file(path)]
+
+    return files
+
+def write_manifest(files):
+    executable = Path("build/debug/out")
+
+    manifest = {"executable": executable.stat().st_mtime_ns if executable.exists() else None, "files": files}
+
+    with manifest_file().open("w", encoding="utf-8") as f:
+        json.dump(manifest, f)
+
+def is_debug_build_current():
+    manifest = read_manifest()
+    executable = Path("build/debug/out")
+
+    if manifest is None or not executable.exists() or manifest.get("executable") != executable.stat().st_mtime_ns:
+        return False
+
+    inputs = debug_build_inputs()
+    files = manifest.get("files", {})
+
+    if {path.as_posix() for path in inputs} != set(files):
+        return False
+
+    was_touched = False
+
+    for path in inputs:
+        stat = path.stat()
+        mtime, size, digest = files[path.as_posix()]
+
+        if [stat.st_mtime_ns, stat.st_size] == [mtime, size]:
+            continue
+
+        # A file that was saved without being changed does not need a rebuild
+        if stat.st_size != size or hash_file(path) != digest:
+            return False
+
+        was_touched = True
+
+    if was_touched:
+        write_manifest(snapshot_debug_build_inputs(manifest))
+
+    return True
+
+def run_debug_build(jobs=None, settings=None):
+    config = read_config()
+
+    # Hash the inputs before building (but after the source lists are updated), so that a file saved during the build is not mistaken for one that was built
+    update_source_lists()
+    inputs = snapshot_debug_build_inputs(read_manifest())
+
+    if config is not None:
+        exit_code = run_timed(lambda: build_tree(config, "debug", ["out"], jobs, settings_options(settings)), "debug build", "build/debug")
+    else:
+        # Check that `build_debug.py` exists
+        build_debug_py = Path(".") / "tools/build_debug.py"
+
+        if not build_debug_py.exists():
+            error("could not find `build_debug.py` in `./tools`")
+            return 1
+
+        # Run `build_debug.py`
+        exit_code = run_timed([sys.executable, build_debug_py, *jobs_arguments(jobs), *settings_arguments(settings)], "debug build", "build/debug")
+
+    if exit_code != 0:
+        error(f"the debug build failed with exit code {exit_code}")
+        return exit_code
+
+    # Remember what was built so that `streamline run` can skip the build next time
+    write_manifest(inputs)
+
+    success("finished debug build")
+
+    return 0
+
+def optimization_arguments(lto, tune):
+    arguments = []
+
+    if lto:
+        arguments.append("--lto")
+
+    if tune:
+        arguments += ["--tune", tune]
+
+    return arguments
+
+def optimization_options(lto, tune):
+    # Always passed, like in the generated scripts, so that leaving one out turns it off again
+    return [f"-DSTREAMLINE_LTO={'ON' if lto else 'OFF'}", f"-DSTREAMLINE_TUNE={tune or ''}"]
+
+def run_release_build(jobs=None, lto=False, tune=None, settings=None):
+    config = read_config()
+
+    if config is not None:
+        options = [*optimization_options(lto, tune), *settings_options(settings)]
+        exit_code = run_timed(lambda: build_tree(config, "release", ["out"], jobs, options), "release build", "build/release")
+    else:
+        # Check that `build_release.py` exists
+        build_release_py = Path(".") / "tools/build_release.py"
+
+        if not build_release_py.exists():
+            error("could not find `build_release.py` in `./tools`")
+            return 1
+
+        # Run `build_release.py`, which doesn't update the source lists itself
+        update_source_lists()
+        exit_code = run_timed([sys.executable, build_release_py, *jobs_arguments(jobs), *optimization_arguments(lto, tune), *settings_arguments(settings)], "release build", "build/release")
+
+    if exit_code != 0:
+        error(f"the release build failed with exit code {exit_code}")
+        return exit_code
+
+    success("finished release build")
+
+    return 0
+
+def has_tests(project_directory="."):
+    config = read_config(project_directory)
+
+    if config is not None:
+        return config["tests"] != "none"
+
+    return (Path(project_directory) / "tools/build_tests.py").exists()
+
+LANE_COLOURS = ["cyan", "magenta", "yellow", "blue"]
+
+def make_prefixed_call(prefix, lock):
+    import subprocess
+
+    # Runs a command like `subprocess.call`, but labels each line of its output with the configuration it belongs to
+    def call(command, **kwargs):
+        process = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True, errors="replace", **kwargs)
+
+        for line in process.stdout:
+            with lock:
+                click.echo(f"{prefix} {line}", nl=False)
+
+        return process.wait()
+
+    return call
+
+def run_parallel_builds(configs, jobs, lto, tune, settings):
+    import threading
+
+    config = read_config()
+
+    if "tests" in configs and not has_tests():
+        error("no testing framework was set up for this project")
+        return 1
+
+    # Update the source lists before the builds start, rather than racing to do it in each of them
+    update_source_lists()
+
+    # `debug` and `tests` share `build/debug`, so they are built by one invocation rather than racing each other
+    lanes = []
+    debug_configs = [name for name in ["debug", "tests"] if name in configs]
+
+    if debug_configs:
+        lanes.append({"name": "+".join(debug_configs), "tree": "debug", "targets": [{"debug": "out", "tests": "test_runner"}[name] for name in debug_configs], "scripts": [{"debug": "build_debug.py", "tests": "build_tests.py"}[name] for name in debug_configs], "options": []})
+
+    if "release" in configs:
+        lanes.append({"name": "release", "tree": "release", "targets": ["out"], "scripts": ["build_release.py"], "options": optimization_options(lto, tune), "arguments": optimization_arguments(lto, tune)})
+
+    # Split the job budget between the configurations, giving any that are left over to the first ones
+    total_jobs = jobs or os.cpu_count() or 1
+
+    for index, lane in enumerate(lanes):
+        lane["jobs"] = max(1, total_jobs // len(lanes) + (1 if index < total_jobs % len(lanes) else 0))
+
+    for lane in lanes:
+        for script in lane["scripts"]:
+            if config is None and not (Path(".") / "tools" / script).exists():
+                error(f"could not find `{script}` in `./tools`")
+                return 1
+
+    # Hash the inputs before building, so that a file saved during the builds is not mistaken for one that was built
+    inputs = snapshot_debug_build_inputs(read_manifest()) if "debug" in configs else None
+
+    context = click.get_current_context()
+    lock = threading.Lock()
+    results = {}
+    width = max(len(lane["name"]) for lane in lanes)
+
+    def build_lane(index, lane):
+        prefix = click.style(f"[{lane['name']}]".ljust(width + 2), fg=LANE_COLOURS[index % len(LANE_COLOURS)])
+        call = make_prefixed_call(prefix, lock)
+
+        if config is not None:
+            command = lambda: build_tree(config, lane["tree"], lane["targets"], lane["jobs"], [*lane["options"], *settings_options(settings)], call, sync=False)
+        else:
+            # Run the scripts for configurations that share a build tree one after the other
+            def command():
+                for script in lane["scripts"]:
+                    exit_code = call([sys.executable, Path(".") / "tools" / script, *jobs_arguments(lane["jobs"]), *lane.get("arguments", []), *settings_arguments(settings)])
+
+                    if exit_code != 0:
+                        return exit_code
+
+                return 0
+
+        # The log records which command each step belongs to, so each thread needs the command's context
+        with context:
+            start = time.time()
+            exit_code = run_timed(command, f"{lane['name'].replace('+', ' and ')} build", BUILD_TREES[lane["tree"]]["directory"])
+
+        with lock:
+            if exit_code == 0:
+                success(f"finished the {lane['name']} build")
+            else:
+                error(f"the {lane['name']} build failed with exit code {exit_code}")
+
+        results[lane["name"]] = (exit_code, time.time() - start)
+
+    descriptions = [f"{lane['name']} (-j {lane['jobs']})" for lane in lanes]
+    info(f"building {', '.join(descriptions)}")
+
+    threads = [threading.Thread(target=build_lane, args=(index, lane)) for index, lane in enumerate(lanes)]
+
+    for thread in threads:
+        thread.start()
+
+    for thread in threads:
+        thread.join()
+
+    # Remember what was built so that `streamline run` can skip the build next time
+    if "debug" in configs and results.get(lanes[0]["name"], (1,))[0] == 0:
+        write_manifest(inputs)
+
+    click.echo()
+    info("results")
+
+    for lane in lanes:
+        exit_code, duration = results[lane["name"]]
+        status = click.style("ok", fg="green") if exit_code == 0 else click.style(f"failed ({exit_code})", fg="red")
+        click.echo(f"  {lane['name']:<{width}}  {format_duration(duration):>8}  {status}")
+
+    return 0 if all(exit_code == 0 for exit_code, _ in results.values()) else 1
+
+def generate_compile_timer():
+    return """import json
+from pathlib import Path
+import subprocess
+import sys
+import time
+
+# Used as `CMAKE_CXX_COMPILER_LAUNCHER` by `streamline build --profile-compile` to time each translation unit
+command = sys.argv[1:]
+output = command[command.index("-o") + 1]
+source = command[command.index("-c") + 1]
+
+start = time.time()
+result = subprocess.run(command, stderr=subprocess.PIPE)
+end = time.time()
+
+# GCC's `-ftime-report` goes to stderr after any diagnostics, which are passed through
+diagnostics, separator, time_report = result.stderr.decode(errors="replace").partition("\\nTime variable")
+sys.stderr.write(diagnostics)
+
+with open(output + ".timing.json", "w", encoding="utf-8") as f:
+    json.dump({"source": str(Path(source).resolve()), "start": start, "end": end, "time_report": separator + time_report}, f)
+
+sys.exit(result.returncode)
+"""
+
+# Lines of GCC's `-ftime-report` look like ` phase parsing    :   0.50 ( 60%)   0.10 ( 50%)   0.61 ( 58%)  12345 kB ( 40%)`
+TIME_REPORT_LINE = re.compile(r"^ (\S.*?)\s*:\s*[\d.]+ \(\s*\d+%\)\s*[\d.]+ \(\s*\d+%\)\s*([\d.]+) \(")
+
+def read_compile_profiles(build_directory):
+    project_directory = Path(".").resolve()
+    profiles = []
+
+    for timing_file in build_directory.rglob("*.timing.json"):
+        timing = json.loads(timing_file.read_text(encoding="utf-8"))
+        source = Path(timing["source"])
+
+        # Leave out third-party code such as Google Test
+        if project_directory not in source.parents or build_directory.resolve() in source.parents:
+            continue
+
+        # Clang writes its `-ftime-trace` output next to the object file
+        object_file = Path(str(timing_file)[:-len(".timing.json")])
+        trace_file = object_file.with_suffix(".json")
+        trace = json.loads(trace_file.read_text(encoding="utf-8")) if trace_file.exists() else None
+
+        profiles.append({
+            "source": source.relative_to(project_directory),
+            "start": timing["start"],
+            "duration": timing["end"] - timing["start"],
+            "trace": trace,
+            "time_report": timing["time_report"],
+        })
+
+    return profiles
+
+def summarise_compile_profiles(profiles):
+    headers = {}
+    templates = {}
+
+    for profile in profiles:
+        if profile["trace"] is not None:
+            for event in profile["trace"]["traceEvents"]:
+                if event.get("ph") != "X":
+                    continue
+
+                detail = event.get("args", {}).get("detail")
+
+                if event["name"] == "Source":
+                    headers[detail] = headers.get(detail, 0) + event["dur"] / 1e6
+                elif event["name"] in ["InstantiateClass", "InstantiateFunction"]:
+                    templates[detail] = templates.get(detail, 0) + event["dur"] / 1e6
+        else:
+            for line in profile["time_report"].splitlines():
+                match = TIME_REPORT_LINE.match(line)
+
+                # GCC only reports template instantiation per translation unit
+                if match and match.group(1) == "template instantiation":
+                    templates[str(profile["source"])] = templates.get(str(profile["source"]), 0) + float(match.group(2))
+
+    return headers, templates
+
+def merge_compile_traces(profiles):
+    first_start = min(profile["start"] for profile in profiles)
+    events = []
+
+    # Give each translation unit its own process so they show as separate tracks
+    for pid, profile in enumerate(profiles, start=1):
+        offset = (profile["start"] - first_start) * 1e6
+
+        events.append({"ph": "M", "pid": pid, "name": "process_name", "args": {"name": str(profile["source"])}})
+
+        if profile["trace"] is not None:
+            for event in profile["trace"]["traceEvents"]:
+                if event.get("ph") == "X":
+                    events.append({**event, "pid": pid, "ts": event["ts"] + offset})
+        else:
+            events.append({"ph": "X", "pid": pid, "tid": 0, "name": "Compile", "ts": offset, "dur": profile["duration"] * 1e6, "args": {"detail": str(profile["source"])}})
+
+            # GCC's phases run one after the other, so they can be laid out in sequence under the compile
+            phase_start = offset
+
+            for line in profile["time_report"].splitlines():
+                match = TIME_REPORT_LINE.match(line)
+
+                if match and match.group(1).startswith("phase "):
+                    duration = float(match.group(2)) * 1e6
+                    events.append({"ph": "X", "pid": pid, "tid": 0, "name": match.group(1), "ts": phase_start, "dur": duration})
+                    phase_start += duration
+
+    return {"traceEvents": events}
+
+def print_ranking(title, costs, top):
+    click.echo()
+    info(title)
+
+    for name, seconds in sorted(costs.items(), key=lambda item: -item[1])[:top]:
+        click.echo(f"{format_duration(seconds):>10}  {name}")
+
+def run_profile_compile(jobs, top):
+    import subprocess
+
+    # Check that this is a Streamline project
+    if not (Path(".") / "tools/build_debug.py").exists():
+        error("could not find `build_debug.py` in `./tools`")
+        return False
+
+    build_directory = Path("build") / "profile-compile"
+    build_directory.mkdir(parents=True, exist_ok=True)
+
+    compile_timer = build_directory / "streamline_compile_timer.py"
+    compile_timer.write_text(generate_compile_timer(), encoding="utf-8")
+
+    # Use the generator the project is configured with, like the other build trees
+    config = read_config() or {**DEFAULT_CONFIG, "generator": find_generator()}
+    configure_command = ["cmake", "-G", GENERATORS[config["generator"]], "-S", ".", "-B", build_directory, f"-DCMAKE_CXX_COMPILER_LAUNCHER={sys.executable};{compile_timer.resolve()}"]
+
+    # Configure once to find out which compiler is used, and then again with its profiling flag
+    update_source_lists()
+    info("configuring `build/profile-compile`")
+
+    if subprocess.call(configure_command, stdout=subprocess.DEVNULL) != 0:
+        error("could not configure `build/profile-compile`")
+        return False
+
+    compiler_identity = read_compiler_identity(build_directory) or ""
+    profiling_flag = "-ftime-trace" if "Clang" in compiler_identity else "-ftime-report"
+
+    if subprocess.call([*configure_command, f"-DCMAKE_CXX_FLAGS={profiling_flag}"], stdout=subprocess.DEVNULL) != 0:
+        error("could not configure `build/profile-compile`")
+        return False
+
+    for stale_file in build_directory.rglob("*.timing.json"):
+        stale_file.unlink()
+
+    info(f"rebuilding everything with `{profiling_flag}`")
+
+    exit_code = run_timed(["cmake", "--build", build_directory, "--clean-first", "--parallel", str(jobs or os.cpu_count() or 1)], "profile build", build_directory)
+
+    if exit_code != 0:
+        error("the profiling build failed")
+        return False
+
+    profiles = read_compile_profiles(build_directory)
+
+    if not profiles:
+        error("no translation units were compiled")
+        return False
+
+    headers, templates = summarise_compile_profiles(profiles)
+
+    print_ranking("slowest translation units", {str(profile["source"]): profile["duration"] for profile in profiles}, top)
+
+    if headers:
+        print_ranking("most expensive headers (total parse time across all translation units)", headers, top)
+    else:
+        click.echo()
+        info("header parse times are only available with Clang (`-ftime-trace`)")
+
+    if templates:
+        print_ranking("template instantiation hotspots", templates, top)
+
+    trace_file = build_directory / "compile_trace.json"
+    trace_file.write_text(json.dumps(merge_compile_traces(profiles)), encoding="utf-8")
+
+    click.echo()
+    success(f"wrote the merged trace to `{trace_file}` (open it in chrome://tracing or https://ui.perfetto.dev)")
+
+    return True
+
+def configure_pgo(config, build_directory, options):
+    import subprocess
+
+    configure_command = ["cmake", "-G", GENERATORS[config["generator"]], "-S", ".", "-B", build_directory, "-DCMAKE_BUILD_TYPE=Release", *options]
+
+    return subprocess.call(configure_command, stdout=subprocess.DEVNULL) == 0
+
+@cli.command(context_settings={"ignore_unknown_options": True})
+@click.option("--tests", is_flag=True, help="Train on the test suite instead of on a run of the project.")
+@click.option("--lto", is_flag=True, help="Use link-time optimisation as well.")
+@click.option("--tune", help="The architecture to generate code for, such as native.")
+@jobs_option
+@click.argument("arguments", nargs=-1, type=click.UNPROCESSED)
+def pgo(tests, lto, tune, jobs, arguments):
+    import shutil
+    import subprocess
+
+    # Check that this is a Streamline project
+    if not (Path(".") / "tools/build_release.py").exists():
+        error("could not find `build_release.py` in `./tools`")
+        sys.exit(1)
+
+    # Both stages share one build tree, since GCC matches profiles to object files by their paths
+    config = read_config() or {**DEFAULT_CONFIG, "generator": find_generator()}
+    build_directory = Path("build") / "pgo"
+    profile_directory = (build_directory / "profiles").resolve()
+    parallel = str(jobs or os.cpu_count() or 1)
+    target = "test_runner" if tests else "out"
+    options = [f"-DBUILD_TESTING={'ON' if tests else 'OFF'}", f"-DSTREAMLINE_LTO={'ON' if lto else 'OFF'}", f"-DSTREAMLINE_TUNE={tune or ''}"]
+
+    update_source_lists()
+    info("configuring `build/pgo`")
+
+    if not configure_pgo(config, build_directory, options):
+        error("could not configure `build/pgo`")
+        sys.exit(1)
+
+    is_clang = "Clang" in (read_compiler_identity(build_directory) or "")
+
+    # 1. Build an instrumented binary
+    shutil.rmtree(profile_directory, ignore_errors=True)
+    generate_flag = f"-fprofile-generate={profile_directory}"
+
+    info("building the instrumented binary")
+
+    if not configure_pgo(config, build_directory, [*options, f"-DCMAKE_CXX_FLAGS={generate_flag}", f"-DCMAKE_EXE_LINKER_FLAGS={generate_flag}"]):
+        error("could not configure `build/pgo`")
+        sys.exit(1)
+
+    if run_timed(["cmake", "--build", build_directory, "--target", target, "--parallel", parallel], "pgo instrumented build", build_directory) != 0:
+        error("the instrumented build failed")
+        sys.exit(1)
+
+    # 2. Run the training workload
+    info(f"training on `{target}`")
+
+    # Run the project from `tools`, like `run.py` does, and the tests from the build tree, like CTest does
+    training_command = [(build_directory / target).resolve(), *arguments]
+    working_directory = build_directory if tests else Path("tools")
+
+    if run_timed(lambda: subprocess.call(training_command, cwd=working_directory), "pgo training") != 0:
+        info("the training run exited with an error, its profile is used anyway")
+
+    # 3. Merge the profiles (GCC reads its `.gcda` files directly)
+    if is_clang:
+        llvm_profdata = shutil.which("llvm-profdata")
+
+        if llvm_profdata is None:
+            error("could not find `llvm-profdata`, which Clang needs to merge profiles")
+            sys.exit(1)
+
+        if subprocess.call([llvm_profdata, "merge", f"--output={profile_directory / 'default.profdata'}", *profile_directory.glob("*.profraw")]) != 0:
+            error("could not merge the profiles")
+            sys.exit(1)
+
+        use_flags = f"-fprofile-use={profile_directory / 'default.profdata'}"
+    else:
+        use_flags = f"-fprofile-use={profile_directory} -fprofile-partial-training -Wno-missing-profile"
+
+    # 4. Rebuild the project with the profile
+    info("building the optimised binary")
+
+    if not configure_pgo(config, build_directory, [*options, f"-DCMAKE_CXX_FLAGS={use_flags}", "-DCMAKE_EXE_LINKER_FLAGS="]):
+        error("could not configure `build/pgo`")
+        sys.exit(1)
+
+    if run_timed(["cmake", "--build", build_directory, "--target", "out", "--parallel", parallel], "pgo optimised build", build_directory) != 0:
+        error("the optimised build failed")
+        sys.exit(1)
+
+    success(f"built the profile-guided binary at `{build_directory / 'out'}`")
+
+def collapse_perf_script(output):
+    # `perf script` prints each sample as a line naming the program, followed by its frames from the innermost outwards
+    stacks = {}
+    program = None
+    frames = []
+
+    for line in [*output.splitlines(), ""]:
+        if not line.strip():
+            if program is not None and frames:
+                stack = ";".join([program, *reversed(frames)])
+                stacks[stack] = stacks.get(stack, 0) + 1
+
+            program = None
+            frames = []
+        elif not line[0].isspace():
+            program = line.split()[0]
+        else:
+            symbol, _, library = line.strip().partition(" ")[2].rpartition(" (")
+            symbol = re.sub(r"\+0x[0-9a-f]+$", "", symbol)
+
+            if symbol in ["", "[unknown]"]:
+                symbol = f"[{Path(library.rstrip(')')).name or 'unknown'}]"
+
+            frames.append(symbol.replace(";", ":"))
+
+    return stacks
+
+def collapse_callgrind(callgrind_file):
+    # Callgrind records the cost of each function and of each call it makes, rather than whole stacks
+    names = {}
+    positions = 1
+    self_costs = {}
+    calls = {}
+    function = None
+    callee = None
+    is_call_cost = False
+
+    def read_name(value):
+        # Names are given once as `(id) name` and then referred to as `(id)`
+        match = re.match(r"^\((\d+)\)(?:\s+(.*))?$", value.strip())
+
+        if match is None:
+            return value.strip()
+
+        if match.group(2) is not None:
+            names[match.group(1)] = match.group(2)
+
+        return names.get(match.group(1), value.strip())
+
+    for line in callgrind_file.read_text(encoding="utf-8", errors="replace").splitlines():
+        if line.startswith("positions:"):
+            positions = len(line.split()) - 1
+        elif line.startswith("fn="):
+            function = read_name(line[3:])
+            self_costs.setdefault(function, 0)
+        elif line.startswith("cfn="):
+            callee = read_name(line[4:])
+        elif line.startswith("calls="):
+            is_call_cost = True
+        elif line[:1] and (line[0].isdigit() or line[0] in "+-*") and function is not None:
+            values = line.split()
+            cost = int(values[positions]) if len(values) > positions else 0
+
+            if is_call_cost:
+                calls.setdefault(function, {})
+                calls[function][callee] = calls[function].get(callee, 0) + cost
+                is_call_cost = False
+            else:
+                self_costs[function] += cost
+
+    inclusive_costs = {function: self_costs.get(function, 0) + sum(calls.get(function, {}).values()) for function in {*self_costs, *calls}}
+    called = {callee for callees in calls.values() for callee in callees}
+    total = sum(self_costs.values())
+    stacks = {}
+
+    # Rebuild stacks from the call graph by sharing each function's costs between its callers in proportion to their calls
+    def expand(function, cost, stack):
+        path = [*stack, function]
+
+        if function in stack or cost < total * 0.0005 or not inclusive_costs.get(function):
+            stacks[";".join(path)] = stacks.get(";".join(path), 0) + cost
+            return
+
+        scale = cost / inclusive_costs[function]
+
+        if self_costs.get(function):
+            stacks[";".join(path)] = stacks.get(";".join(path), 0) + self_costs[function] * scale
+
+        for callee, call_cost in calls.get(function, {}).items():
+            expand(callee, call_cost * scale, path)
+
+    for function in sorted(inclusive_costs):
+        if function not in called and inclusive_costs[function] > 0:
+            expand(function, inclusive_costs[function], [])
+
+    return stacks
+
+def generate_flame_graph(stacks, title, unit):
+    import html
+    import zlib
+
+    # Merge the stacks into a tree, where each frame's width is the cost of everything that was running under it
+    root = {"name": "all", "value": 0, "children": {}}
+
+    for stack, value in stacks.items():
+        node = root
+        root["value"] += value
+
+        for frame in stack.split(";"):
+            node = node["children"].setdefault(frame, {"name": frame, "value": 0, "children": {}})
+            node["value"] += value
+
+    def find_depth(node):
+        return 1 + max((find_depth(child) for child in node["children"].values()), default=0)
+
+    width = 1200
+    frame_height = 16
+    height = find_depth(root) * frame_height + 50
+    scale = (width - 20) / (root["value"] or 1)
+    frames = []
+
+    def draw(node, x, level):
+        frame_width = node["value"] * scale
+
+        if frame_width < 0.1:
+            return
+
+        # Warm colours, chosen by name so that a function keeps its colour between profiles
+        checksum = zlib.crc32(node["name"].encode())
+        colour = f"rgb({205 + checksum % 50},{(checksum >> 8) % 230},{(checksum >> 16) % 55})"
+        y = height - 10 - (level + 1) * frame_height
+        characters = int((frame_width - 6) / 7)
+        label = node["name"] if len(node["name"]) <= characters else node["name"][:characters - 2] + ".." if characters > 2 else ""
+        percentage = 100 * node["value"] / (root["value"] or 1)
+
+        frames.append(f'<g><title>{html.escape(node["name"])} ({node["value"]:,.0f} {unit}, {percentage:.2f}%)</title><rect x="{x:.1f}" y="{y}" width="{frame_width:.1f}" height="{frame_height - 1}" fill="{colour}" rx="2"/><text x="{x + 3:.1f}" y="{y + 11}">{html.escape(label)}</text></g>')
+
+        for child in sorted(node["children"].values(), key=lambda child: child["name"]):
+            draw(child, x, level + 1)
+            x += child["value"] * scale
+
+    draw(root, 10, 0)
+
+    return f"""<?xml version="1.0" standalone="no"?>
+<svg version="1.1" width="{width}" height="{height}" xmlns="http://www.w3.org/2000/svg">
+<style>text {{ font-family: monospace; font-size: 11px; fill: #000; pointer-events: none; }} rect:hover {{ stroke: #000; }}</style>
+<rect width="100%" height="100%" fill="#fff8ee"/>
+<text x="{width / 2}" y="20" text-anchor="middle" style="font-size: 15px">{html.escape(title)}</text>
+{chr(10).join(frames)}
+</svg>
+"""
+
+def summarise_stacks(stacks):
+    # A function's own cost comes from the samples where it was innermost, and its total from every sample it appears in
+    self_costs = {}
+    total_costs = {}
+
+    for stack, value in stacks.items():
+        frames = stack.split(";")
+        self_costs[frames[-1]] = self_costs.get(frames[-1], 0) + value
+
+        for frame in set(frames):
+            total_costs[frame] = total_costs.get(frame, 0) + value
+
+    return self_costs, total_costs
+
+@cli.command(context_settings={"ignore_unknown_options": True})
+@click.option("--tests", is_flag=True, help="Profile the test runner instead of the project.")
+@click.option("--top", type=click.IntRange(min=1), default=20, help="The number of functions to show in the table of hot functions.")
+@click.option("--frequency", type=click.IntRange(min=1), default=999, help="How many times a second `perf` samples the program.")
+@click.option("--open", is_flag=True, help="Whether to open the flame graph after generating it.")
+@jobs_option
+@click.argument("arguments", nargs=-1, type=click.UNPROCESSED)
+def profile(tests, top, frequency, open, jobs, arguments):
+    import shutil
+    import subprocess
+    import webbrowser
+
+    if tests and not has_tests():
+        error("no testing framework was set up for this project")
+        sys.exit(1)
+
+    perf = shutil.which("perf")
+    valgrind = shutil.which("valgrind")
+
+    if perf is None and valgrind is None:
+        error("could not find `perf` or `valgrind` to profile with")
+        sys.exit(1)
+
+    # Optimised like a release build, but with debug information and frame pointers so that stacks can be unwound
+    config = read_config() or {**DEFAULT_CONFIG, "generator": find_generator()}
+    build_directory = Path(BUILD_TREES["profile"]["directory"])
+    target = "test_runner" if tests else "out"
+
+    info("building `build/profile`")
+
+    if run_timed(lambda: build_tree(config, "profile", [target], jobs), "profile build", build_directory) != 0:
+        error("the profiling build failed")
+        sys.exit(1)
+
+    # Run the project from `tools`, like `run.py` does
+    command = [(build_directory / target).resolve(), *arguments]
+    working_directory = build_directory if tests else Path("tools")
+    stacks = None
+
+    if perf is not None:
+        perf_data = (build_directory / "perf.data").resolve()
+
+        info(f"recording `{target}` with perf")
+
+        exit_code = run_timed(lambda: subprocess.call([perf, "record", "--quiet", "-F", str(frequency), "--call-graph", "fp", "-o", perf_data, "--", *command], cwd=working_directory), "profile run")
+
+        if perf_data.exists() and perf_data.stat().st_size > 0:
+            script = subprocess.run([perf, "script", "-i", perf_data, "-F", "comm,ip,sym,dso"], capture_output=True, text=True, errors="replace")
+            stacks = collapse_perf_script(script.stdout)
+            unit = "samples"
+
+        if not stacks:
+            info("perf could not record the program (check `/proc/sys/kernel/perf_event_paranoid`)")
+
+    if not stacks and valgrind is not None:
+        callgrind_file = (build_directory / "callgrind.out").resolve()
+
+        info(f"recording `{target}` with callgrind (this is much slower than running it normally)")
+
+        exit_code = run_timed(lambda: subprocess.call([valgrind, "--tool=callgrind", f"--callgrind-out-file={callgrind_file}", *command], cwd=working_directory), "profile run")
+
+        if callgrind_file.exists():
+            stacks = collapse_callgrind(callgrind_file)
+            unit = "instructions"
+
+    if not stacks:
+        error("no samples were recorded")
+        sys.exit(1)
+
+    if exit_code != 0:
+        info(f"`{target}` exited with code {exit_code}, its profile is shown anyway")
+
+    # Keep the collapsed stacks too, since other flame graph tools can read them
+    folded_file = build_directory / "stacks.folded"
+    folded_file.write_text("".join(f"{stack} {round(value)}\n" for stack, value in sorted(stacks.items())), encoding="utf-8")
+
+    flame_graph_file = build_directory / "flamegraph.svg"
+    flame_graph_file.write_text(generate_flame_graph(stacks, f"{target} {' '.join(arguments)}".strip(), unit), encoding="utf-8")
+
+    self_costs, total_costs = summarise_stacks(stacks)
+    total = sum(stacks.values())
+
+    click.echo()
+    info("hot functions")
+    click.echo(f"{'self':>8}  {'total':>8}  function")
+
+    for function, value in sorted(self_costs.items(), key=lambda item: -item[1])[:top]:
+        click.echo(f"{100 * value / total:>7.2f}%  {100 * total_costs[function] / total:>7.2f}%  {function}")
+
+    click.echo()
+    success(f"wrote the flame graph to `{flame_graph_file}`")
+
+    if open:
+        webbrowser.open("file://" + str(flame_graph_file.resolve()))
+
+def generate_allocation_counter():
+    return """// Preloaded by `streamline run --memprof` and `streamline test --memprof` when neither heaptrack nor Valgrind is installed
+#define _GNU_SOURCE
+#include <dlfcn.h>
+#include <malloc.h>
+#include <stdio.h>
+#include <stdlib.h>
+
+#define TABLE_SIZE 65536
+
+struct site {
+    void* address;
+    unsigned long count;
+    unsigned long bytes;
+};
+
+extern void* __libc_malloc(size_t);
+extern void* __libc_calloc(size_t, size_t);
+extern void* __libc_realloc(void*, size_t);
+extern void* __libc_memalign(size_t, size_t);
+extern void __libc_free(void*);
+
+static struct site sites[TABLE_SIZE];
+static unsigned long total_count;
+static unsigned long total_bytes;
+static long current_bytes;
+static long peak_bytes;
+static __thread int depth;
+
+// Count an allocation against the code that asked for it, unless it was made on behalf of an allocation that is already counted
+static void record(void* address, size_t size, void* pointer) {
+    if (pointer == NULL || depth > 0) {
+        return;
+    }
+
+    __atomic_add_fetch(&total_count, 1, __ATOMIC_RELAXED);
+    __atomic_add_fetch(&total_bytes, size, __ATOMIC_RELAXED);
+
+    long current = __atomic_add_fetch(&current_bytes, (long)malloc_usable_size(pointer), __ATOMIC_RELAXED);
+    long peak = __atomic_load_n(&peak_bytes, __ATOMIC_RELAXED);
+
+    while (current > peak && !__atomic_compare_exchange_n(&peak_bytes, &peak, current, 1, __ATOMIC_RELAXED, __ATOMIC_RELAXED)) {
+    }
+
+    unsigned long index = ((unsigned long)address >> 4) % TABLE_SIZE;
+
+    for (int probe = 0; probe < TABLE_SIZE; probe++, index = (index + 1) % TABLE_SIZE) {
+        void* expected = NULL;
+
+        if (__atomic_load_n(&sites[index].address, __ATOMIC_ACQUIRE) == address
+            || __atomic_compare_exchange_n(&sites[index].address, &expected, address, 0, __ATOMIC_ACQ_REL, __ATOMIC_ACQUIRE)
+            || expected == address) {
+            __atomic_add_fetch(&sites[index].count, 1, __ATOMIC_RELAXED);
+            __atomic_add_fetch(&sites[index].bytes, size, __ATOMIC_RELAXED);
+            return;
+        }
+    }
+}
+
+static void forget(void* pointer) {
+    if (pointer != NULL && depth == 0) {
+        __atomic_sub_fetch(&current_bytes, (long)malloc_usable_size(pointer), __ATOMIC_RELAXED);
+    }
+}
+
+void* malloc(size_t size) {
+    void* pointer = __libc_malloc(size);
+    record(__builtin_return_address(0), size, pointer);
+    return pointer;
+}
+
+void* calloc(size_t count, size_t size) {
+    void* pointer = __libc_calloc(count, size);
+    record(__builtin_return_address(0), count * size, pointer);
+    return pointer;
+}
+
+void* realloc(void* old_pointer, size_t size) {
+    forget(old_pointer);
+    void* pointer = __libc_realloc(old_pointer, size);
+    record(__builtin_return_address(0), size, pointer);
+    return pointer;
+}
+
+int posix_memalign(void** pointer, size_t alignment, size_t size) {
+    *pointer = __libc_memalign(alignment, size);
+    record(__builtin_return_address(0), size, *pointer);
+    return *pointer == NULL ? 12 : 0;
+}
+
+void* aligned_alloc(size_t alignment, size_t size) {
+    void* pointer = __libc_memalign(alignment, size);
+    record(__builtin_return_address(0), size, pointer);
+    return pointer;
+}
+
+void free(void* pointer) {
+    forget(pointer);
+    __libc_free(pointer);
+}
+
+// `operator new` and `operator new[]`, so that allocations are counted against their callers rather than against libstdc++
+static void* (*real_new)(size_t);
+static void* (*real_new_array)(size_t);
+
+void* _Znwm(size_t size) {
+    if (real_new == NULL) {
+        real_new = (void* (*)(size_t))dlsym(RTLD_NEXT, "_Znwm");
+    }
+
+    depth++;
+    void* pointer = real_new(size);
+    depth--;
+    record(__builtin_return_address(0), size, pointer);
+    return pointer;
+}
+
+void* _Znam(size_t size) {
+    if (real_new_array == NULL) {
+        real_new_array = (void* (*)(size_t))dlsym(RTLD_NEXT, "_Znam");
+    }
+
+    depth++;
+    void* pointer = real_new_array(size);
+    depth--;
+    record(__builtin_return_address(0), size, pointer);
+    return pointer;
+}
+
+__attribute__((destructor)) static void write_report(void) {
+    const char* path = getenv("STREAMLINE_ALLOCATIONS");
+
+    if (path == NULL) {
+        return;
+    }
+
+    depth++;
+
+    FILE* report = fopen(path, "w");
+
+    if (report == NULL) {
+        return;
+    }
+
+    fprintf(report, "allocations %lu\\nallocated_bytes %lu\\npeak_heap %ld\\n", total_count, total_bytes, peak_bytes);
+
+    // The program's own high-water mark, which its parent can't see since `ru_maxrss` carries over from before `exec`
+    FILE* status = fopen("/proc/self/status", "r");
+    char line[4096];
+    long peak_rss;
+
+    while (status != NULL && fgets(line, sizeof line, status) != NULL) {
+        if (sscanf(line, "VmHWM: %ld kB", &peak_rss) == 1) {
+            fprintf(report, "peak_rss %ld\\n", peak_rss * 1024);
+        }
+    }
+
+    if (status != NULL) {
+        fclose(status);
+    }
+
+    for (int index = 0; index < TABLE_SIZE; index++) {
+        if (sites[index].address != NULL) {
+            fprintf(report, "site %p %lu %lu\\n", sites[index].address, sites[index].count, sites[index].bytes);
+        }
+    }
+
+    // The memory map is needed to turn the addresses back into functions and lines
+    FILE* maps = fopen("/proc/self/maps", "r");
+
+    while (maps != NULL && fgets(line, sizeof line, maps) != NULL) {
+        fprintf(report, "map %s", line);
+    }
+
+    if (maps != NULL) {
+        fclose(maps);
+    }
+
+    fclose(report);
+}
+"""
+
+def parse_size(size):
+    # heaptrack prints sizes like `73.73K`
+    match = re.match(r"^([\d.]+)([KMGT]?)i?B?$", size)
+
+    if match is None:
+        return None
+
+    return round(float(match.group(1)) * 1000 ** " KMGT".index(match.group(2) or " "))
+
+def read_heaptrack(output):
+    summary = {"peak_rss": None, "peak_heap": None, "allocations": None, "allocated_bytes": None, "sites": {}}
+    section = None
+    lines = output.splitlines()
+
+    for index, line in enumerate(lines):
+        if line in ["MOST CALLS TO ALLOCATION FUNCTIONS", "PEAK MEMORY CONSUMERS"]:
+            section = line
+            continue
+
+        if not line or line[0].isspace():
+            continue
+
+        by_calls = re.match(r"^(\d+) calls to allocation functions with (\S+) peak consumption from$", line)
+        by_bytes = re.match(r"^(\S+) peak memory consumed over (\d+) calls from$", line)
+
+        # Each entry is followed by the function that allocated, and then where it is
+        if (by_calls or by_bytes) and section is not None and index + 1 < len(lines):
+            count, size = (by_calls.group(1), by_calls.group(2)) if by_calls else (by_bytes.group(2), by_bytes.group(1))
+            site = lines[index + 1].strip()
+
+            if index + 2 < len(lines) and lines[index + 2].strip().startswith("at "):
+                site += f" ({Path(lines[index + 2].strip()[3:]).name})"
+
+            summary["sites"][site] = {"count": int(count), "bytes": parse_size(size)}
+        elif line.startswith("calls to allocation functions:"):
+            summary["allocations"] = int(line.split()[4])
+        elif line.startswith("peak RSS (including heaptrack overhead):"):
+            summary["peak_rss"] = parse_size(line.split(":")[1].split()[0])
+        elif line.startswith("peak heap memory consumption:"):
+            summary["peak_heap"] = parse_size(line.split()[4])
+        elif line.startswith("bytes allocated in total"):
+            summary["allocated_bytes"] = parse_size(line.split(":")[1].split()[0])
+
+    return summary
+
+def read_massif(massif_file):
+    summary = {"peak_rss": None, "peak_heap": None, "allocations": None, "allocated_bytes": None, "sites": {}}
+    heap = 0
+    is_peak = False
+
+    # Massif takes snapshots of the heap, and breaks the peak one down by the code that allocated it
+    for line in massif_file.read_text(encoding="utf-8", errors="replace").splitlines():
+        if line.startswith("mem_heap_B="):
+            heap = int(line.partition("=")[2])
+        elif line.startswith("mem_heap_extra_B="):
+            heap += int(line.partition("=")[2])
+            summary["peak_heap"] = max(summary["peak_heap"] or 0, heap)
+        elif line.startswith("heap_tree="):
+            is_peak = line == "heap_tree=peak"
+        elif is_peak:
+            match = re.match(r"^ n\d+: (\d+) 0x[0-9A-Fa-f]+: (.*)$", line)
+
+            if match:
+                summary["sites"][match.group(2)] = {"count": None, "bytes": int(match.group(1))}
+
+    return summary
+
+def read_allocation_counter(report_file):
+    import subprocess
+
+    summary = {"peak_rss": None, "peak_heap": None, "allocations": None, "allocated_bytes": None, "sites": {}}
+    sites = []
+    mappings = []
+
+    for line in report_file.read_text(encoding="utf-8", errors="replace").splitlines():
+        kind, _, value = line.partition(" ")
+
+        if kind in ["allocations", "allocated_bytes", "peak_heap", "peak_rss"]:
+            summary[kind] = int(value)
+        elif kind == "site":
+            address, count, size = value.split()
+            sites.append((int(address, 16), int(count), int(size)))
+        elif kind == "map":
+            fields = value.split(None, 5)
+
+            if len(fields) == 6 and fields[5].startswith("/"):
+                start, end = (int(part, 16) for part in fields[0].split("-"))
+                mappings.append((start, end, int(fields[2], 16), fields[5].strip()))
+
+    # Turn each return address into an address in its file, and ask `addr2line` where that is
+    addresses_by_file = {}
+
+    for address, count, size in sites:
+        for start, end, offset, path in mappings:
+            if start <= address < end:
+                addresses_by_file.setdefault(path, []).append((address, address - 1 - start + offset))
+                break
+
+    names = {}
+
+    for path, addresses in addresses_by_file.items():
+        output = subprocess.run(["addr2line", "-f", "-C", "-e", path, *(hex(file_address) for _, file_address in addresses)], capture_output=True, text=True).stdout.splitlines()
+
+        for (address, _), function, location in zip(addresses, output[0::2], output[1::2]):
+            location = location.split(" ")[0]
+            names[address] = f"{function} ({Path(location).name})" if not location.startswith("??") else f"{function} [{Path(path).name}]"
+
+    for address, count, size in sites:
+        site = names.get(address, hex(address))
+        previous = summary["sites"].get(site, {"count": 0, "bytes": 0})
+        summary["sites"][site] = {"count": previous["count"] + count, "bytes": previous["bytes"] + size}
+
+    return summary
+
+def format_bytes(size):
+    if size is None:
+        return "-"
+
+    for unit in ["B", "KiB", "MiB", "GiB"]:
+        if abs(size) < 1024 or unit == "GiB":
+            return f"{size:.0f}{unit}" if unit == "B" else f"{size:.1f}{unit}"
+
+        size /= 1024
+
+def format_change(before, after):
+    if before is None or after is None:
+        return ""
+
+    if before == 0:
+        return "" if after == 0 else click.style(" (new)", fg="red")
+
+    change = (after - before) / before
+
+    return click.style(f" ({change:+.1%})", fg="red" if change > 0.05 else "green" if change < -0.05 else None)
+
+def profile_memory(target, arguments, working_directory, top=10):
+    import shutil
+    import subprocess
+
+    build_directory = Path("build/debug")
+    output_directory = Path("build") / "memprof"
+    output_directory.mkdir(parents=True, exist_ok=True)
+    command = [(build_directory / target).resolve(), *arguments]
+    heaptrack = shutil.which("heaptrack")
+    valgrind = shutil.which("valgrind")
+
+    # Prefer heaptrack, then Valgrind's massif, and fall back to counting allocations with a preloaded library
+    if heaptrack is not None:
+        tool = "heaptrack"
+        prefix = (output_directory / f"{target}.heaptrack").resolve()
+
+        for stale_file in output_directory.glob(f"{target}.heaptrack*"):
+            stale_file.unlink()
+
+        info(f"running `{target}` under heaptrack")
+
+        exit_code = subprocess.call([heaptrack, "-o", prefix, *command], cwd=working_directory)
+        recordings = sorted(output_directory.glob(f"{target}.heaptrack*"))
+
+        if not recordings:
+            error("heaptrack did not record anything")
+            return 1
+
+        summary = read_heaptrack(subprocess.run(["heaptrack_print", recordings[-1]], capture_output=True, text=True, errors="replace").stdout)
+    elif valgrind is not None:
+        tool = "massif"
+        massif_file = (output_directory / f"{target}.massif").resolve()
+
+        info(f"running `{target}` under massif (this is much slower than running it normally)")
+
+        exit_code = subprocess.call([valgrind, "--tool=massif", f"--massif-out-file={massif_file}", *command], cwd=working_directory)
+
+        if not massif_file.exists():
+            error("massif did not record anything")
+            return 1
+
+        summary = read_massif(massif_file)
+    else:
+        tool = "allocation counter"
+        compiler = shutil.which("cc") or shutil.which("gcc") or shutil.which("clang")
+
+        if compiler is None or not sys.platform.startswith("linux"):
+            error("could not find heaptrack, Valgrind, or a C compiler to count allocations with")
+            return 1
+
+        source_file = output_directory / "allocation_counter.c"
+        library = (output_directory / "allocation_counter.so").resolve()
+        report_file = (output_directory / f"{target}.allocations").resolve()
+
+        if not library.exists() or not source_file.exists() or source_file.read_text(encoding="utf-8") != generate_allocation_counter():
+            source_file.write_text(generate_allocation_counter(), encoding="utf-8")
+
+            if subprocess.call([compiler, "-shared", "-fPIC", "-O2", "-fexceptions", "-o", library, source_file, "-ldl"]) != 0:
+                error("could not compile the allocation counter")
+                return 1
+
+        report_file.unlink(missing_ok=True)
+
+        info(f"running `{target}` with an allocation counter")
+
+        environment = {**os.environ, "LD_PRELOAD": f"{library} {os.environ.get('LD_PRELOAD', '')}".strip(), "STREAMLINE_ALLOCATIONS": str(report_file)}
+        exit_code = subprocess.call(command, cwd=working_directory, env=environment)
+
+        if not report_file.exists():
+            error("the allocation counter did not write a report")
+            return 1
+
+        summary = read_allocation_counter(report_file)
+
+    # Compare with the previous summary for this target, as long as it was made with the same tool
+    summary_file = output_directory / f"{target}.json"
+
+    try:
+        previous = json.loads(summary_file.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        previous = None
+
+    if previous is not None and previous.get("tool") != tool:
+        previous = None
+
+    summary = {"tool": tool, "time": time.time(), "exit_code": exit_code, **summary}
+    summary_file.write_text(json.dumps(summary, indent=4), encoding="utf-8")
+
+    click.echo()
+    info(f"memory usage of `{target}` ({tool})")
+
+    for name, key, formatter in [("peak RSS", "peak_rss", format_bytes), ("peak heap", "peak_heap", format_bytes), ("allocations", "allocations", lambda count: "-" if count is None else f"{count:,}"), ("allocated", "allocated_bytes", format_bytes)]:
+        change = format_change(previous.get(key), summary[key]) if previous is not None else ""
+        click.echo(f"  {name:<12} {formatter(summary[key]):>12}{change}")
+
+    if tool == "heaptrack":
+        click.echo("  (heaptrack's peak RSS includes its own overhead)")
+    elif tool == "massif":
+        click.echo("  (there is no peak RSS under Valgrind, which runs the program on its own simulated CPU)")
+
+    sites = summary["sites"]
+
+    for title, key in [("top allocation sites by bytes", "bytes"), ("top allocation sites by count", "count")]:
+        ranked = sorted((site for site in sites if sites[site][key] is not None), key=lambda site: -sites[site][key])[:top]
+
+        if not ranked:
+            continue
+
+        click.echo()
+        info(title)
+
+        for site in ranked:
+            previous_site = (previous or {}).get("sites", {}).get(site, {})
+            change = format_change(previous_site.get(key), sites[site][key]) if previous is not None else ""
+            value = format_bytes(sites[site]["bytes"]) if key == "bytes" else f"{sites[site]['count']:,}"
+            click.echo(f"  {value:>12}{change}  {site}")
+
+    click.echo()
+    success(f"wrote the summary to `{summary_file}`")
+
+    if exit_code != 0:
+        error(f"`{target}` exited with code {exit_code}")
+
+    return exit_code
+
+def run_program(arguments=()):
+    import subprocess
+
+    # Run the program from `tools`, like `run.py` does
+    if read_config() is not None:
+        return run_timed(lambda: subprocess.call([Path("build/debug/out").resolve(), *arguments], cwd="tools"), "run")
+
+    # Check that `run.py` exists
+    run_py = Path(".") / "tools/run.py"
+
+    if not run_py.exists():
+        error("could not find `run.py` in `./tools`")
+        return 1
+    
+    # Run `run.py`
+    return run_timed([sys.executable, run_py, *arguments], "run")
+
+def memprof_option(function):
+    return click.option("--memprof", is_flag=True, help="Profile heap allocations and peak memory, using heaptrack, Valgrind's massif, or an allocation counter.")(function)
+
+@cli.command(context_settings={"ignore_unknown_options": True})
+@jobs_option
+@memprof_option
+@click.argument("arguments", nargs=-1, type=click.UNPROCESSED)
+def run(jobs, memprof, arguments):
+    import subprocess
+
+    # Skip the build entirely when nothing `out` depends on has changed since the last successful build
+    start = time.time()
+
+    if not memprof and is_debug_build_current():
+        # The program replaces this process, so only the skipped build can be logged for `stats`, not the run itself
+        write_log_record({"time": start, "command": "run", "phase": "skipped build", "duration": time.time() - start, "exit_code": 0})
+
+        if os.name == "posix":
+            # Replace this process so that signals and the exit code go straight to the program, matching `run.py`
+            os.chdir("tools")
+            executable = "../build/debug/out"
+            os.execv(executable, [executable, *arguments])
+
+        sys.exit(subprocess.call(["../build/debug/out", *arguments], cwd="tools"))
+
+    exit_code = run_debug_build(jobs)
+
+    if exit_code != 0:
+        sys.exit(exit_code)
+
+    # Add a space to separate the build and run outputs
+    click.echo()
+
+    if memprof:
+        sys.exit(profile_memory("out", arguments, Path("tools")))
+
+    exit_code = run_program(arguments)
+
+    if exit_code != 0:
+        sys.exit(exit_code)
+
+def read_doxyfile(doxyfile):
+    # Join the lines that are continued with a backslash, and then split each setting into its values
+    lines = []
+    continued_line = ""
+
+    for line in doxyfile.read_text(encoding="utf-8").splitlines():
+        line = line.strip()
+
+        if line.startswith("#") and not continued_line:
+            continue
+
+        if line.endswith("\\"):
+            continued_line += line[:-1] + " "
+            continue
+
+        lines.append(continued_line + line)
+        continued_line = ""
+
+    settings = {}
+
+    for line in lines:
+        match = re.match(r"^([A-Z_]+)\s*(\+?=)(.*)$", line)
+
+        if match is None:
+            continue
+
+        name, operator, values = match.groups()
+
+        # Doxygen only groups values with double quotes, so an apostrophe is an ordinary character
+        values = [quoted or bare for quoted, bare in re.findall(r'"([^"]*)"|(\S+)', values)]
+        settings[name] = settings.get(name, []) + values if operator == "+=" else values
+
+    return settings
+
+def find_doxygen_inputs(doxyfile):
+    import fnmatch
+
+    # Paths in the Doxyfile are relative to the directory that Doxygen runs in, which is the Doxyfile's
+    settings = read_doxyfile(doxyfile)
+    directory = doxyfile.parent
+    patterns = settings.get("FILE_PATTERNS") or ["*"]
+    excluded = [(directory / path).resolve() for path in settings.get("EXCLUDE", [])]
+    exclude_patterns = settings.get("EXCLUDE_PATTERNS", [])
+    is_recursive = settings.get("RECURSIVE") == ["YES"]
+    inputs = set()
+
+    for entry in settings.get("INPUT") or ["."]:
+        path = (directory / entry).resolve()
+
+        if path.is_file():
+            inputs.add(path)
+        elif path.is_dir():
+            for candidate in path.rglob("*") if is_recursive else path.glob("*"):
+                if candidate.is_file() and any(fnmatch.fnmatch(candidate.name, pattern) for pattern in patterns):
+                    inputs.add(candidate)
+
+    return sorted(
+        path for path in inputs
+        if not any(path == exclude or exclude in path.parents for exclude in excluded)
+        and not any(fnmatch.fnmatch(str(path), pattern) for pattern in exclude_patterns)
+    )
+
+def docs_fingerprint(doxyfile):
+    import hashlib
+    import shutil
+
+    # Everything Doxygen reads: its configuration, its version, and the files that match `FILE_PATTERNS`
+    digest = hashlib.sha256()
+    digest.update(str(shutil.which("doxygen")).encode())
+    digest.update(doxyfile.read_bytes())
+
+    for path in find_doxygen_inputs(doxyfile):
+        digest.update(str(path).encode())
+        digest.update(path.read_bytes())
+
+    return digest.hexdigest()
+
+@cli.command()
+@click.option("--open", is_flag=True, help="Whether to open the documentation after generating it.")
+@click.option("-j", "--jobs", type=click.IntRange(min=1), help="The number of threads for Doxygen to use (defaults to the number of cores).")
+def docs(open, jobs):
+    import shutil
+    import subprocess
+    import webbrowser
+
+    config = read_config()
+
+    if config is not None:
+        if config["docs"] != "doxygen":
+            error("no documentation generator was set up for this project")
+            sys.exit(1)
+
+        if shutil.which("doxygen") is None:
+            error("could not find `doxygen`")
+            sys.exit(1)
+
+        # Run Doxygen from `tools`, where the Doxyfile is, like `build_docs.py` does
+        doxyfile_text = (Path("tools") / "Doxyfile").read_text(encoding="utf-8")
+        command = lambda: subprocess.run(["doxygen", "-q", "-"], input=f"{doxyfile_text}\nNUM_PROC_THREADS = {jobs or os.cpu_count() or 1}\n", text=True, cwd="tools").returncode
+    else:
+        # Check that `build_docs.py` exists
+        build_docs_py = Path(".") / "tools/build_docs.py"
+
+        if not build_docs_py.exists():
+            error("could not find `build_docs.py` in `./tools`")
+            sys.exit(1)
+
+        command = [sys.executable, build_docs_py, *jobs_arguments(jobs)]
+
+    # Skip Doxygen when none of its inputs have changed since it last succeeded
+    doxyfile = Path("tools") / "Doxyfile"
+    output_directory = Path("docs")
+    fingerprint_file = Path("build") / "streamline_docs_fingerprint.txt"
+    current_fingerprint = docs_fingerprint(doxyfile) if doxyfile.exists() else None
+
+    if current_fingerprint is not None and output_directory.exists() and fingerprint_file.exists() and fingerprint_file.read_text() == current_fingerprint:
+        success("documentation is up to date")
+    else:
+        info("generating documentation")
+
+        exit_code = run_timed(command, "docs")
+
+        if exit_code != 0:
+            error(f"generating the documentation failed with exit code {exit_code}")
+            sys.exit(exit_code)
+
+        if current_fingerprint is not None:
+            fingerprint_file.parent.mkdir(exist_ok=True)
+            fingerprint_file.write_text(current_fingerprint)
+
+        success("documentation generated")
+
+    # Open the documentation if requested
+    if open:
+        webbrowser.open("file://" + str((Path(".") / "docs/html/index.html").absolute()))
+
+TEST_MACRO = re.compile(r"^\s*(?:TEST|TEST_F|TEST_P|TYPED_TEST|TYPED_TEST_P)\s*\(\s*(\w+)\s*,\s*(\w+)\s*\)", re.MULTILINE)
+
+def read_dependencies(build_directory, include_external=False):
+    import subprocess
+
+    # The files that each translation unit was compiled from, as recorded by the compiler, keyed by its source file
+    build_directory = Path(build_directory)
+    dependency_lists = []
+
+    if (build_directory / ".ninja_deps").exists():
+        # Ninja keeps the dependencies in its own database, listing each object file followed by its indented dependencies
+        output = subprocess.run(["ninja", "-C", build_directory, "-t", "deps"], capture_output=True, text=True).stdout
+
+        for line in output.splitlines():
+            if line and not line[0].isspace():
+                dependency_lists.append([])
+            elif line.strip() and dependency_lists:
+                dependency_lists[-1].append(line.strip())
+    else:
+        # Other generators leave the compiler's Make-style dependency files next to the object files
+        for dependency_file in build_directory.rglob("*.o.d"):
+            rule = dependency_file.read_text(encoding="utf-8", errors="replace").replace("\\\n", " ")
+            prerequisites = rule.partition(": ")[2]
+            dependency_lists.append([path.replace("\\ ", " ") for path in re.split(r"(?<!\\)\s+", prerequisites) if path])
+
+    project_directory = Path.cwd().resolve()
+    output_directory = build_directory.resolve()
+    dependencies = {}
+
+    # The compiler lists the source file first, and only files in the project (outside the build trees) can change between runs
+    for dependency_list in dependency_lists:
+        if not dependency_list:
+            continue
+
+        paths = [(build_directory / path).resolve() for path in dependency_list]
+        dependencies[paths[0]] = {path for path in paths if include_external or (project_directory in path.parents and output_directory not in path.parents and path.parent != output_directory)}
+
+    return dependencies
+
+def find_test_inputs(test_source, dependencies):
+    # A test depends on what it includes, and on the shared sources that share headers with it, followed transitively
+    shared_sources = {source: inputs for source, inputs in dependencies.items() if (Path("src").resolve() in source.parents and source.name != "main.cpp")}
+
+    # Shared sources whose dependencies are unknown (such as in a unity build) could affect any test
+    unknown_sources = {path.resolve() for path in Path("src").rglob("*.cpp") if path.name != "main.cpp"} - set(shared_sources)
+
+    if test_source not in dependencies:
+        return {test_source, *Path("src").resolve().rglob("*")}
+
+    inputs = set(dependencies[test_source]) | unknown_sources
+    is_growing = True
+
+    while is_growing:
+        is_growing = False
+
+        for source, source_inputs in shared_sources.items():
+            if source not in inputs and source_inputs & (inputs - {source}):
+                inputs |= source_inputs
+                is_growing = True
+
+    return inputs
+
+def hash_test_inputs(test_sources):
+    import hashlib
+
+    dependencies = read_dependencies("build/debug")
+    shared_inputs = [path.resolve() for path in [Path("CMakeLists.txt"), Path("src/CMakeLists.txt"), Path("tests/CMakeLists.txt"), Path("streamline.toml"), *Path(".").glob("*.cmake")] if path.exists()]
+    hashes = {}
+
+    for test_source in test_sources:
+        digest = hashlib.sha256()
+
+        for path in sorted({*find_test_inputs(test_source, dependencies), *shared_inputs}):
+            digest.update(str(path).encode())
+            digest.update(path.read_bytes() if path.is_file() else b"")
+
+        hashes[test_source.relative_to(Path.cwd().resolve()).as_posix()] = digest.hexdigest()
+
+    return hashes
+
+def test_name_pattern(suite, name):
+    # Matches plain, typed (`Suite/0.Name`) and parameterised (`Prefix/Suite.Name/0`) test names, in both CTest's and Python's regular expressions
+    return f"{suite}(/[0-9]+)?\\.{name}(/|$)"
+
+@cli.command()
+@jobs_option
+@click.option("--filter", help="Only run the tests whose names match this regular expression.")
+@click.option("--repeat", type=click.IntRange(min=1), default=1, help="Run each test up to this many times, stopping at its first failure.")
+@click.option("--all", "all_tests", is_flag=True, help="Run every test, even those whose inputs are unchanged since they last passed.")
+@memprof_option
+def test(jobs, filter, repeat, all_tests, memprof):
+    # Check that there are tests
+    if not any(Path("tests").rglob("*.cpp")):
+        error("no tests exist to run")
+        return
+
+    # The test runner is profiled directly rather than through CTest, which starts it once per test
+    if memprof and (filter is not None or repeat > 1):
+        error("`--memprof` runs every test once, so it cannot be combined with `--filter` or `--repeat`")
+        sys.exit(1)
+    
+    config = read_config()
+
+    if config is not None:
+        if config["tests"] != "gtest":
+            error("no testing framework was set up for this project")
+            sys.exit(1)
+
+        build_command = lambda: build_tree(config, "debug", ["test_runner"], jobs)
+
+        # The tests are registered with CTest by `gtest_discover_tests`, like in `test.py`
+        test_command = ["ctest", "--test-dir", "build/debug", "--output-on-failure", "--parallel", str(jobs or os.cpu_count() or 1)]
+        filter_option = "--tests-regex"
+
+        if repeat > 1:
+            test_command += ["--repeat", f"until-fail:{repeat}"]
+    else:
+        # Check that `build_tests.py` and `test.py` exist
+        build_tests_py = Path(".") / "tools/build_tests.py"
+        test_py = Path(".") / "tools/test.py"
+
+        for script in [build_tests_py, test_py]:
+            if not script.exists():
+                error(f"could not find `{script.name}` in `./tools`")
+                sys.exit(1)
+
+        update_source_lists()
+        build_command = [sys.executable, build_tests_py, *jobs_arguments(jobs)]
+        test_command = [sys.executable, test_py, *jobs_arguments(jobs)]
+        filter_option = "--filter"
+
+        if repeat > 1:
+            test_command += ["--repeat", str(repeat)]
+    
+    info("building tests")
+
+    exit_code = run_timed(build_command, "test build", "build/debug")
+
+    if exit_code != 0:
+        error(f"the tests failed to build with exit code {exit_code}")
+        sys.exit(exit_code)
+
+    success("tests built")
+
+    if memprof:
+        click.echo()
+        sys.exit(profile_memory("test_runner", [], Path("build/debug")))
+
+    # Only rerun the tests in files whose inputs have changed since they last passed, unless specific tests were asked for
+    cache_file = Path("build/debug") / "streamline_test_cache.json"
+    failed_log = Path("build/debug") / "Testing" / "Temporary" / "LastTestsFailed.log"
+    test_sources = sorted(path.resolve() for path in Path("tests").rglob("*.cpp"))
+    hashes = hash_test_inputs(test_sources) if filter is None else {}
+    tests_by_file = {source: TEST_MACRO.findall((Path.cwd() / source).read_text(encoding="utf-8", errors="replace")) for source in hashes}
+
+    try:
+        passed = json.loads(cache_file.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        passed = {}
+
+    passed = {source: digest for source, digest in passed.items() if source in hashes}
+    changed = [source for source, digest in hashes.items() if all_tests or repeat > 1 or passed.get(source) != digest]
+
+    if filter is not None:
+        test_command += [filter_option, filter]
+    elif not changed:
+        success("no tests have changed inputs since they last passed (use `--all` to run them anyway)")
+        return
+    elif len(changed) < len(hashes) and all(tests_by_file[source] for source in changed):
+        test_command += [filter_option, "|".join(test_name_pattern(suite, name) for source in changed for suite, name in tests_by_file[source])]
+
+        info(f"running the tests in {len(changed)} of {len(hashes)} test files, which have not passed with their current inputs (use `--all` to run every test)")
+    
+    info("running tests")
+
+    failed_log.unlink(missing_ok=True)
+    exit_code = run_timed(test_command, "tests")
+
+    # Record which files passed, so that they can be skipped until their inputs change
+    if filter is None:
+        failed_tests = [line.partition(":")[2] for line in failed_log.read_text(encoding="utf-8").splitlines()] if failed_log.exists() else []
+
+        for source in changed:
+            is_known_result = exit_code == 0 or (failed_log.exists() and tests_by_file[source])
+            has_failures = any(re.search(test_name_pattern(suite, name), failed_test) for suite, name in tests_by_file[source] for failed_test in failed_tests)
+
+            if is_known_result and not has_failures:
+                passed[source] = hashes[source]
+            else:
+                passed.pop(source, None)
+
+        cache_file.write_text(json.dumps(passed), encoding="utf-8")
+
+    if exit_code != 0:
+        sys.exit(exit_code)
+
+def is_watched_file(name):
+    # Ignore the temporary and backup files that editors write alongside the real ones
+    return not (name.startswith(".") or name.startswith("#") or name.endswith("~") or name.endswith(".swp") or name.endswith(".tmp"))
+
+def make_polling_waiter(directories):
+    def snapshot():
+        files = {}
+
+        for directory in directories:
+            for root, _, names in os.walk(directory):
+                for name in names:
+                    if is_watched_file(name):
+                        path = os.path.join(root, name)
+
+                        try:
+                            status = os.stat(path)
+                        except FileNotFoundError:
+                            continue
+
+                        files[path] = (status.st_mtime_ns, status.st_size)
+
+        return files
+
+    previous = snapshot()
+
+    def wait_for_changes(timeout):
+        nonlocal previous
+
+        deadline = time.monotonic() + timeout
+
+        while True:
+            current = snapshot()
+
+            if current != previous:
+                previous = current
+                return True
+
+            remaining = deadline - time.monotonic()
+
+            if remaining <= 0:
+                return False
+
+            time.sleep(min(remaining, 0.5))
+
+    return wait_for_changes
+
+# From `<sys/inotify.h>`
+IN_MODIFY = 0x2
+IN_CLOSE_WRITE = 0x8
+IN_MOVED_FROM = 0x40
+IN_MOVED_TO = 0x80
+IN_CREATE = 0x100
+IN_DELETE = 0x200
+IN_ISDIR = 0x40000000
+
+def make_inotify_waiter(directories):
+    import ctypes
+    import select
+    import struct
+
+    libc = ctypes.CDLL(None, use_errno=True)
+    fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+
+    if fd < 0:
+        raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+
+    mask = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+    watched_directories = {}
+
+    def watch(directory):
+        for root, _, _ in os.walk(directory):
+            wd = libc.inotify_add_watch(fd, os.fsencode(root), mask)
+
+            if wd < 0:
+                raise OSError(ctypes.get_errno(), f"could not watch `{root}`")
+
+            watched_directories[wd] = root
+
+    for directory in directories:
+        watch(directory)
+
+    def wait_for_changes(timeout):
+        readable, _, _ = select.select([fd], [], [], timeout)
+
+        if not readable:
+            return False
+
+        events = os.read(fd, 64 * 1024)
+        offset = 0
+        is_relevant = False
+
+        # Each event is a `struct inotify_event` followed by a null-padded name
+        while offset < len(events):
+            wd, event_mask, _, name_length = struct.unpack_from("iIII", events, offset)
+            name = events[offset + 16:offset + 16 + name_length].rstrip(b"\0").decode(errors="replace")
+            offset += 16 + name_length
+
+            if event_mask & IN_ISDIR:
+                # Watch new directories too
+                if event_mask & (IN_CREATE | IN_MOVED_TO) and wd in watched_directories:
+                    watch(os.path.join(watched_directories[wd], name))
+
+                is_relevant = True
+            elif is_watched_file(name):
+                is_relevant = True
+
+        return is_relevant
+
+    return wait_for_changes
+
+def make_waiter(directories, poll):
+    if not poll and sys.platform.startswith("linux"):
+        try:
+            return make_inotify_waiter(directories), "inotify"
+        except (OSError, AttributeError):
+            pass
+
+    return make_polling_waiter(directories), "polling"
+
+def start_step(command, working_directory=None):
+    import subprocess
+
+    # Start each step in its own process group so that everything it spawns can be cancelled with it
+    if os.name == "posix":
+        return subprocess.Popen(command, cwd=working_directory, start_new_session=True)
+
+    return subprocess.Popen(command, cwd=working_directory)
+
+def cancel_step(process):
+    import signal
+    import subprocess
+
+    if process is None or process.poll() is not None:
+        return
+
+    if os.name == "posix":
+        os.killpg(process.pid, signal.SIGTERM)
+    else:
+        process.terminate()
+
+    try:
+        process.wait(timeout=5)
+    except subprocess.TimeoutExpired:
+        if os.name == "posix":
+            os.killpg(process.pid, signal.SIGKILL)
+        else:
+            process.kill()
+
+        process.wait()
+
+@cli.command()
+@click.argument("action", type=click.Choice(["build", "run", "test"]), default="build")
+@jobs_option
+@click.option("--debounce", type=click.FloatRange(min=0), default=0.2, help="How many seconds to wait for a burst of saves to finish before rebuilding.")
+@click.option("--poll", is_flag=True, help="Poll for changes instead of using inotify.")
+def watch(action, jobs, debounce, poll):
+    # The first build goes through the generated script so that the build tree gets configured
+    if action == "test":
+        script = Path(".") / "tools/build_tests.py"
+        target = "test_runner"
+        directories = ["src", "tests"]
+    else:
+        script = Path(".") / "tools/build_debug.py"
+        target = "out"
+        directories = ["src"]
+
+    if not script.exists():
+        error(f"could not find `{script.name}` in `./tools`")
+        return
+
+    # Each step is a command and the directory to run it in, which for the program is `tools`, like `run.py` does
+    parallel = str(jobs or os.cpu_count() or 1)
+    build_step = (["cmake", "--build", "build/debug", "--target", target, "--parallel", parallel], None)
+    run_step = (["../build/debug/out"], "tools")
+    first_steps = [([sys.executable, script, "--jobs", parallel], None)]
+
+    if action == "run":
+        first_steps.append(run_step)
+    elif action == "test":
+        first_steps.append((["ctest", "--test-dir", "build/debug", "--output-on-failure", "--parallel", parallel], None))
+
+    wait_for_changes, method = make_waiter(directories, poll)
+    info(f"watching {' and '.join(f'`{directory}`' for directory in directories)} for changes using {method} (press Ctrl+C to stop)")
+
+    steps = first_steps
+    process = None
+    is_pending = True
+
+    try:
+        while True:
+            if is_pending:
+                # Wait for a burst of saves to settle, and then replace whatever is still running
+                while wait_for_changes(debounce):
+                    pass
+
+                cancel_step(process)
+
+                if steps[0] == build_step:
+                    click.echo()
+                    info("change detected, rebuilding")
+
+                # Pick up sources that have been added or removed, since `cmake --build` only sees what is in `sources.cmake`
+                if update_source_lists():
+                    # Rewriting a source list is itself a change, which shouldn't cancel the build it's for
+                    while wait_for_changes(0):
+                        pass
+
+                process = start_step(*steps[0])
+                steps = steps[1:]
+                is_pending = False
+
+            if wait_for_changes(0.1):
+                is_pending = True
+                steps = [build_step, *first_steps[1:]]
+                continue
+
+            if process is None or process.poll() is None:
+                continue
+
+            # Move on to the next step once the current one has finished
+            if process.returncode == 0 and steps:
+                if steps[0] == run_step:
+                    click.echo()
+
+                process = start_step(*steps[0])
+                steps = steps[1:]
+                continue
+
+            if process.returncode == 0:
+                success(f"finished {action}, waiting for changes")
+            else:
+                error(f"{action} failed with exit code {process.returncode}, waiting for changes")
+
+            process = None
+            steps = []
+    except KeyboardInterrupt:
+        cancel_step(process)
+        click.echo()
+        info("stopped watching")
+
+def mann_whitney_u(first, second):
+    import math
+
+    # Two-sided Mann-Whitney U test using the normal approximation with a correction for ties, returning the p-value
+    ranked = sorted([(value, 0) for value in first] + [(value, 1) for value in second])
+    ranks = [0.0] * len(ranked)
+    tie_correction = 0
+    i = 0
+
+    while i < len(ranked):
+        j = i
+
+        while j + 1 < len(ranked) and ranked[j + 1][0] == ranked[i][0]:
+            j += 1
+
+        for k in range(i, j + 1):
+            ranks[k] = (i + j) / 2 + 1
+
+        tie_correction += (j - i + 1) ** 3 - (j - i + 1)
+        i = j + 1
+
+    n1 = len(first)
+    n2 = len(second)
+    rank_sum = sum(rank for rank, (_, group) in zip(ranks, ranked) if group == 0)
+    u = rank_sum - n1 * (n1 + 1) / 2
+    variance = n1 * n2 / 12 * ((n1 + n2 + 1) - tie_correction / ((n1 + n2) * (n1 + n2 - 1)))
+
+    if variance == 0:
+        return 1.0
+
+    z = (abs(u - n1 * n2 / 2) - 0.5) / math.sqrt(variance)
+
+    return math.erfc(max(z, 0) / math.sqrt(2))
+
+# Multipliers to convert Google Benchmark's time units to nanoseconds
+TIME_UNITS = {"ns": 1, "us": 1e3, "ms": 1e6, "s": 1e9}
+
+def read_benchmark_samples(results):
+    samples = {}
+
+    for benchmark in results["benchmarks"]:
+        if benchmark.get("run_type", "iteration") == "iteration":
+            samples.setdefault(benchmark.get("run_name", benchmark["name"]), []).append(benchmark["real_time"] * TIME_UNITS[benchmark["time_unit"]])
+
+    return samples
+
+def median(values):
+    values = sorted(values)
+    middle = len(values) // 2
+
+    if len(values) % 2 == 1:
+        return values[middle]
+
+    return (values[middle - 1] + values[middle]) / 2
+
+def format_nanoseconds(nanoseconds):
+    for unit in ["s", "ms", "us"]:
+        if nanoseconds >= TIME_UNITS[unit]:
+            return f"{nanoseconds / TIME_UNITS[unit]:.3g} {unit}"
+
+    return f"{nanoseconds:.3g} ns"
+
+def compare_benchmarks(baseline, results, alpha, threshold):
+    baseline_samples = read_benchmark_samples(baseline)
+    regressions = []
+
+    click.echo(f"{'benchmark':<40}{'baseline':>12}{'current':>12}{'change':>10}{'p-value':>10}")
+
+    for name, samples in read_benchmark_samples(results).items():
+        if name not in baseline_samples:
+            click.echo(f"{name:<40}{'-':>12}{format_nanoseconds(median(samples)):>12}{'new':>10}{'-':>10}")
+            continue
+
+        before = median(baseline_samples[name])
+        after = median(samples)
+        change = after / before - 1
+        p_value = mann_whitney_u(baseline_samples[name], samples) if len(samples) > 1 and len(baseline_samples[name]) > 1 else 1.0
+
+        click.echo(f"{name:<40}{format_nanoseconds(before):>12}{format_nanoseconds(after):>12}{change:>+10.1%}{p_value:>10.3f}")
+
+        # A regression has to be both statistically significant and large enough to matter
+        if p_value < alpha and change > threshold:
+            regressions.append(name)
+
+    return regressions
+
+@cli.command()
+@jobs_option
+@click.option("--filter", help="Only run the benchmarks whose names match this regular expression.")
+@click.option("--repetitions", type=click.IntRange(min=1), default=10, help="The number of times to repeat each benchmark.")
+@click.option("--save", help="Save the results as a named baseline in `bench/baselines`.")
+@click.option("--compare", help="Compare the results with a named baseline and fail on significant regressions.")
+@click.option("--alpha", type=click.FloatRange(0, 1), default=0.05, help="The significance level for detecting regressions.")
+@click.option("--threshold", type=click.FloatRange(min=0), default=0.05, help="The smallest slowdown that counts as a regression (0.05 means 5%).")
+def bench(jobs, filter, repetitions, save, compare, alpha, threshold):
+    import shutil
+    import subprocess
+
+    # Check that there are benchmarks
+    if not any(Path("bench").rglob("*.cpp")):
+        error("no benchmarks exist to run")
+        sys.exit(1)
+
+    baseline_file = Path("bench") / "baselines" / f"{compare}.json"
+
+    if compare is not None and not baseline_file.exists():
+        error(f"could not find the baseline `{baseline_file}`")
+        sys.exit(1)
+
+    config = read_config()
+    results_file = (Path("build") / "bench" / "results.json").resolve()
+
+    if config is not None:
+        if config["bench"] != "gbench":
+            error("no benchmarking framework was set up for this project")
+            sys.exit(1)
+
+        build_command = lambda: build_tree(config, "bench", ["bench_runner"], jobs, optimization_options(False, None))
+
+        # Run the benchmarks from `tools`, like `bench.py` does
+        bench_command = [Path("build/bench/bench_runner").resolve(), f"--benchmark_repetitions={repetitions}", f"--benchmark_out={results_file}", "--benchmark_out_format=json"]
+
+        if filter is not None:
+            bench_command.append(f"--benchmark_filter={filter}")
+
+        run_command = lambda: subprocess.call(bench_command, cwd="tools")
+    else:
+        # Check that `build_bench.py` and `bench.py` exist
+        build_bench_py = Path(".") / "tools/build_bench.py"
+        bench_py = Path(".") / "tools/bench.py"
+
+        for script in [build_bench_py, bench_py]:
+            if not script.exists():
+                error(f"could not find `{script.name}` in `./tools`")
+                sys.exit(1)
+
+        update_source_lists()
+        build_command = [sys.executable, build_bench_py, *jobs_arguments(jobs)]
+        run_command = [sys.executable, bench_py, "--repetitions", str(repetitions), "--out", str(results_file)]
+
+        if filter is not None:
+            run_command += ["--filter", filter]
+
+    info("building benchmarks")
+
+    if run_timed(build_command, "bench build", "build/bench") != 0:
+        error("the benchmarks failed to build")
+        sys.exit(1)
+
+    success("benchmarks built")
+
+    info("running benchmarks")
+
+    if run_timed(run_command, "benchmarks") != 0:
+        error("the benchmarks failed")
+        sys.exit(1)
+
+    results = json.loads(results_file.read_text(encoding="utf-8"))
+
+    if save is not None:
+        saved_file = Path("bench") / "baselines" / f"{save}.json"
+        saved_file.parent.mkdir(exist_ok=True)
+        shutil.copyfile(results_file, saved_file)
+
+        success(f"saved the results as the baseline `{save}`")
+
+    if compare is not None:
+        click.echo()
+        info(f"comparing with the baseline `{compare}`")
+
+        regressions = compare_benchmarks(json.loads(baseline_file.read_text(encoding="utf-8")), results, alpha, threshold)
+
+        click.echo()
+
+        if regressions:
+            error(f"{len(regressions)} benchmark(s) regressed: {', '.join(regressions)}")
+            sys.exit(1)
+
+        success("no significant regressions")
+
+def read_elf_sections(path):
+    import struct
+
+    data = Path(path).read_bytes()
+
+    if data[:4] != b"\x7fELF":
+        return None
+
+    # Read the section headers, which are laid out differently in 32-bit and 64-bit files
+    is_64_bit = data[4] == 2
+    endianness = "<" if data[5] == 1 else ">"
+    header_format = endianness + ("IIQQQQIIQQ" if is_64_bit else "IIIIIIIIII")
+
+    if is_64_bit:
+        section_offset = struct.unpack_from(endianness + "Q", data, 0x28)[0]
+        entry_size, section_count, names_index = struct.unpack_from(endianness + "HHH", data, 0x3A)
+    else:
+        section_offset = struct.unpack_from(endianness + "I", data, 0x20)[0]
+        entry_size, section_count, names_index = struct.unpack_from(endianness + "HHH", data, 0x2E)
+
+    if section_offset == 0:
+        return []
+
+    headers = lambda index: struct.unpack_from(header_format, data, section_offset + index * entry_size)
+
+    # Objects with a lot of sections, which C++ templates easily produce, keep the real counts in the first section header
+    if section_count == 0:
+        section_count = headers(0)[5]
+
+    if names_index == 0xFFFF:
+        names_index = headers(0)[6]
+
+    names_offset = headers(names_index)[4]
+    sections = []
+
+    for index in range(1, section_count):
+        name, kind, flags, _, _, size = headers(index)[:6]
+        name = data[names_offset + name:data.index(b"\0", names_offset + name)].decode(errors="replace")
+        sections.append({"name": name, "size": size, "is_allocated": bool(flags & 0x2), "is_code": bool(flags & 0x4), "is_zeroed": kind == 8})
+
+    return sections
+
+def read_symbols(path):
+    import shutil
+    import subprocess
+
+    if shutil.which("nm") is None:
+        return None
+
+    symbols = {}
+    output = subprocess.run(["nm", "-C", "-S", "--size-sort", "--defined-only", path], capture_output=True, text=True, errors="replace").stdout
+
+    # Each line is the address, size, type, and demangled name of a symbol
+    for line in output.splitlines():
+        fields = line.split(" ", 3)
+
+        if len(fields) == 4 and fields[2].lower() in "tdbrvw":
+            symbols[fields[3]] = symbols.get(fields[3], 0) + int(fields[1], 16)
+
+    return symbols
+
+def template_name(symbol):
+    # Protect the operators whose names contain angle brackets before removing template arguments
+    operators = re.findall(r"operator(?:<=>|<<=|>>=|<<|>>|<=|>=|->\*|->|<|>)", symbol)
+    name = re.sub(r"operator(?:<=>|<<=|>>=|<<|>>|<=|>=|->\*|->|<|>)", "\0", symbol)
+
+    if "<" not in name:
+        return None
+
+    while re.search(r"<[^<>]*>", name):
+        name = re.sub(r"<[^<>]*>", "\1", name)
+
+    # Instantiations differ in their parameter types too, so leave those out as well
+    name = name.replace("(anonymous namespace)", "\2")
+    name = name.split("(")[0].replace("\1", "<…>").replace("\2", "(anonymous namespace)")
+
+    for operator in operators:
+        name = name.replace("\0", operator, 1)
+
+    return name
+
+def find_object_files(build_directory, target):
+    translation_units = {}
+
+    # CMake puts the objects for each target in `CMakeFiles/<target>.dir`, named after their sources
+    for object_file in sorted(build_directory.rglob("*.o")):
+        directory = next((part for part in object_file.parts if part.endswith(".dir")), None)
+
+        if directory not in ["core_objects.dir", f"{target}.dir"]:
+            continue
+
+        name = object_file.as_posix().split(f"/{directory}/", 1)[1][:-len(".o")]
+        translation_units[name] = object_file
+
+    return translation_units
+
+def measure_size(build_directory, target):
+    binary = build_directory / target
+    sections = read_elf_sections(binary)
+
+    if sections is None:
+        return None
+
+    report = {"target": target, "file_size": binary.stat().st_size, "allocated": 0, "unallocated": 0, "sections": {}, "translation_units": {}, "symbols": read_symbols(binary) or {}, "templates": {}}
+
+    # Only the allocated sections are loaded into memory, and the rest are mostly debug information and symbol tables
+    for section in sections:
+        if not section["is_allocated"]:
+            report["unallocated"] += section["size"]
+        elif section["size"] > 0:
+            report["allocated"] += section["size"]
+            report["sections"][section["name"]] = section["size"]
+
+    # Object sizes are from before linking, so code that is deduplicated or discarded by the linker is counted in every object that has it
+    for name, object_file in find_object_files(build_directory, target).items():
+        object_sections = read_elf_sections(object_file) or []
+
+        if any(section["name"].startswith(".gnu.lto_") for section in object_sections):
+            report["translation_units"] = None
+            break
+
+        report["translation_units"][name] = {
+            "text": sum(section["size"] for section in object_sections if section["is_allocated"] and section["is_code"]),
+            "data": sum(section["size"] for section in object_sections if section["is_allocated"] and not section["is_code"] and not section["is_zeroed"]),
+            "bss": sum(section["size"] for section in object_sections if section["is_allocated"] and section["is_zeroed"]),
+        }
+
+    for symbol, size in report["symbols"].items():
+        name = template_name(symbol)
+
+        if name is not None:
+            group = report["templates"].setdefault(name, {"count": 0, "size": 0})
+            group["count"] += 1
+            group["size"] += size
+
+    return report
+
+def format_size_change(before, after):
+    difference = after - before
+    change = difference / before if before else None
+    colour = "red" if change is None or change > 0.05 else "green" if change < -0.05 else None
+
+    # Padded before styling, since the colour codes would otherwise throw the columns out
+    return f"{('+' if difference >= 0 else '-') + format_bytes(abs(difference)):>12}" + click.style(f"{'new' if change is None else f'{change:+.1%}':>10}", fg=colour)
+
+def print_size_report(report, top):
+    info(f"`{report['target']}` is {format_bytes(report['file_size'])} on disk, of which {format_bytes(report['allocated'])} is loaded")
+
+    click.echo()
+    click.echo(f"{'section':<32}{'size':>12}")
+
+    for name, size in sorted(report["sections"].items(), key=lambda item: -item[1]):
+        click.echo(f"{name:<32}{format_bytes(size):>12}")
+
+    if report["unallocated"]:
+        click.echo(f"{'(not loaded)':<32}{format_bytes(report['unallocated']):>12}")
+
+    if report["translation_units"] is None:
+        click.echo()
+        info("the objects contain LTO bytecode, so there are no sizes for each translation unit")
+    elif report["translation_units"]:
+        click.echo()
+        click.echo(f"{'translation unit':<40}{'text':>12}{'data':>12}{'bss':>12}")
+
+        for name, sizes in sorted(report["translation_units"].items(), key=lambda item: -sum(item[1].values()))[:top]:
+            click.echo(f"{name:<40}{format_bytes(sizes['text']):>12}{format_bytes(sizes['data']):>12}{format_bytes(sizes['bss']):>12}")
+
+    if report["symbols"]:
+        click.echo()
+        click.echo(f"{'size':>12}  symbol")
+
+        for name, size in sorted(report["symbols"].items(), key=lambda item: -item[1])[:top]:
+            click.echo(f"{format_bytes(size):>12}  {name}")
+
+    templates = {name: group for name, group in report["templates"].items() if group["count"] > 1}
+
+    if templates:
+        click.echo()
+        click.echo(f"{'size':>12}{'count':>8}  template")
+
+        for name, group in sorted(templates.items(), key=lambda item: -item[1]["size"])[:top]:
+            click.echo(f"{format_bytes(group['size']):>12}{group['count']:>8}  {name}")
+
+def compare_sizes(baseline, report, top):
+    click.echo(f"{'':<32}{'baseline':>12}{'current':>12}{'change':>22}")
+    click.echo(f"{'file':<32}{format_bytes(baseline['file_size']):>12}{format_bytes(report['file_size']):>12}{format_size_change(baseline['file_size'], report['file_size'])}")
+    click.echo(f"{'loaded':<32}{format_bytes(baseline['allocated']):>12}{format_bytes(report['allocated']):>12}{format_size_change(baseline['allocated'], report['allocated'])}")
+
+    for name in sorted(set(baseline["sections"]) | set(report["sections"])):
+        before = baseline["sections"].get(name, 0)
+        after = report["sections"].get(name, 0)
+
+        if before != after:
+            click.echo(f"{name:<32}{format_bytes(before):>12}{format_bytes(after):>12}{format_size_change(before, after)}")
+
+    # Show the translation units and symbols that changed the most, in either direction
+    for title, before_sizes, after_sizes in [
+        ("translation unit", {name: sum(sizes.values()) for name, sizes in (baseline["translation_units"] or {}).items()}, {name: sum(sizes.values()) for name, sizes in (report["translation_units"] or {}).items()}),
+        ("symbol", baseline["symbols"], report["symbols"]),
+        ("template", {name: group["size"] for name, group in baseline["templates"].items()}, {name: group["size"] for name, group in report["templates"].items()}),
+    ]:
+        changes = [(name, before_sizes.get(name, 0), after_sizes.get(name, 0)) for name in set(before_sizes) | set(after_sizes) if before_sizes.get(name, 0) != after_sizes.get(name, 0)]
+
+        if not changes:
+            continue
+
+        click.echo()
+        click.echo(f"{'change':>22}  {title}")
+
+        for name, before, after in sorted(changes, key=lambda change: -abs(change[2] - change[1]))[:top]:
+            click.echo(f"{format_size_change(before, after)}  {name}")
+
+@cli.command()
+@click.option("--debug/--release", default=True, help="Whether to measure the debug or the release build.")
+@click.option("--tests", is_flag=True, help="Measure the test runner instead of the project (debug builds only).")
+@click.option("--top", type=click.IntRange(min=1), default=20, help="The number of rows to show in each table.")
+@click.option("--save", help="Save the sizes as a named baseline in `size/baselines`.")
+@click.option("--compare", help="Compare the sizes with a named baseline.")
+@click.option("--max-growth", type=click.FloatRange(min=0), help="Fail if the loaded size grew by more than this much since the baseline (0.05 means 5%).")
+@click.option("--lto", is_flag=True, help="Measure a release build that uses link-time optimisation.")
+@click.option("--tune", help="Measure a release build that generates code for this architecture, such as native.")
+@jobs_option
+def size(debug, tests, top, save, compare, max_growth, lto, tune, jobs):
+    if debug and (lto or tune):
+        error("`--lto` and `--tune` only apply to release builds (add `--release`)")
+        sys.exit(1)
+
+    if tests and not debug:
+        error("the tests are only built in debug mode")
+        sys.exit(1)
+
+    if tests and not has_tests():
+        error("no testing framework was set up for this project")
+        sys.exit(1)
+
+    if max_growth is not None and compare is None:
+        error("`--max-growth` needs a baseline to compare with")
+        sys.exit(1)
+
+    baseline_file = Path("size") / "baselines" / f"{compare}.json"
+
+    if compare is not None and not baseline_file.exists():
+        error(f"could not find the baseline `{baseline_file}`")
+        sys.exit(1)
+
+    # Build first, so that the sizes are of the current sources
+    tree = "debug" if debug else "release"
+    target = "test_runner" if tests else "out"
+    config = read_config()
+
+    if not tests:
+        exit_code = run_debug_build(jobs) if debug else run_release_build(jobs, lto, tune)
+    elif config is not None:
+        exit_code = run_timed(lambda: build_tree(config, "debug", ["test_runner"], jobs), "test build", "build/debug")
+    else:
+        update_source_lists()
+        exit_code = run_timed([sys.executable, Path("tools/build_tests.py"), *jobs_arguments(jobs)], "test build", "build/debug")
+
+    if exit_code != 0:
+        error(f"`{target}` failed to build")
+        sys.exit(1)
+
+    report = measure_size(Path(BUILD_TREES[tree]["directory"]), target)
+
+    if report is None:
+        error(f"`{target}` is not an ELF binary, which is the only format that sizes can be measured for")
+        sys.exit(1)
+
+    click.echo()
+    print_size_report(report, top)
+
+    Path(BUILD_TREES[tree]["directory"], f"streamline_size_{target}.json").write_text(json.dumps(report), encoding="utf-8")
+
+    if save is not None:
+        saved_file = Path("size") / "baselines" / f"{save}.json"
+        saved_file.parent.mkdir(parents=True, exist_ok=True)
+        saved_file.write_text(json.dumps(report, indent=4), encoding="utf-8")
+
+        click.echo()
+        success(f"saved the sizes as the baseline `{save}`")
+
+    if compare is not None:
+        baseline = json.loads(baseline_file.read_text(encoding="utf-8"))
+
+        click.echo()
+        info(f"comparing with the baseline `{compare}`")
+
+        compare_sizes(baseline, report, top)
+
+        click.echo()
+
+        growth = report["allocated"] / baseline["allocated"] - 1 if baseline["allocated"] else 0
+
+        if max_growth is not None and growth > max_growth:
+            error(f"the loaded size of `{target}` grew by {growth:.1%}, more than the allowed {max_growth:.1%}")
+            sys.exit(1)
+
+        success(f"the loaded size of `{target}` changed by {growth:+.1%}")
+
+SOURCE_EXTENSIONS = [".cpp", ".cc", ".cxx", ".c"]
+HEADER_EXTENSIONS = [".hpp", ".h", ".hh", ".hxx", ".ipp", ".tpp", ".inl"]
+INCLUDE_DIRECTIVE = re.compile(r'^[ \t]*#[ \t]*include[ \t]*([<"])([^>"\n]+)[>"]', re.MULTILINE)
+
+def read_cmake_paths(commands):
+    import shlex
+
+    paths = []
+
+    # The paths given to these commands in the project's own CMake files, with the first argument taken as the target for `target_*` commands
+    for cmake_file in [Path("CMakeLists.txt"), Path("src/CMakeLists.txt"), Path("tests/CMakeLists.txt"), Path("bench/CMakeLists.txt")]:
+        if not cmake_file.exists():
+            continue
+
+        text = re.sub(r"#.*", "", cmake_file.read_text(encoding="utf-8", errors="replace"))
+
+        for command, arguments in re.findall(rf"\b({'|'.join(commands)})\s*\(([^)]*)\)", text):
+            arguments = shlex.split(arguments)
+
+            for argument in arguments[1:] if command.startswith("target_") else arguments:
+                if argument in ["SYSTEM", "BEFORE", "AFTER", "INTERFACE", "PUBLIC", "PRIVATE"]:
+                    continue
+
+                argument = re.sub(r"^\$<BUILD_INTERFACE:(.*)>$", r"\1", argument)
+                argument = argument.replace("${CMAKE_CURRENT_SOURCE_DIR}", str(cmake_file.parent.resolve())).replace("${CMAKE_CURRENT_LIST_DIR}", str(cmake_file.parent.resolve()))
+                argument = argument.replace("${PROJECT_SOURCE_DIR}", str(Path.cwd().resolve())).replace("${CMAKE_SOURCE_DIR}", str(Path.cwd().resolve()))
+
+                # Anything that still depends on CMake's variables or generator expressions can't be followed
+                if "${" in argument or "$<" in argument:
+                    continue
+
+                path = (cmake_file.parent / argument).resolve()
+
+                if path not in paths:
+                    paths.append(path)
+
+    return paths
+
+def find_include_directories():
+    return [path for path in read_cmake_paths(["target_include_directories", "include_directories"]) if path.is_dir()]
+
+def find_precompiled_headers():
+    # The project's own headers given to `target_precompile_headers`, leaving out external ones like `<gtest/gtest.h>`
+    return [path for path in read_cmake_paths(["target_precompile_headers"]) if path.is_file()]
+
+def find_system_include_directories():
+    import shutil
+    import subprocess
+
+    compiler = shutil.which("c++") or shutil.which("g++") or shutil.which("clang++")
+
+    if compiler is None:
+        return []
+
+    # The compiler lists its own search path when run verbosely
+    output = subprocess.run([compiler, "-x", "c++", "-E", "-v", "-"], stdin=subprocess.DEVNULL, capture_output=True, text=True, errors="replace").stderr
+    search_list = output.partition("#include <...> search starts here:")[2].partition("End of search list.")[0]
+
+    return [Path(line.strip().removesuffix(" (framework directory)")).resolve() for line in search_list.splitlines() if line.strip()]
+
+def scan_includes(files, include_directories, system_include_directories):
+    graph = {}
+    lines = {}
+    pending = list(files)
+
+    # Follow every `#include` from the project's files, into external headers too, without evaluating the preprocessor's conditions
+    while pending:
+        path = pending.pop()
+
+        if path in graph:
+            continue
+
+        graph[path] = []
+
+        if isinstance(path, str):
+            lines[path] = 0
+            continue
+
+        text = path.read_text(encoding="utf-8", errors="replace")
+        lines[path] = text.count("\n")
+
+        for kind, name in INCLUDE_DIRECTIVE.findall(text):
+            search_path = [path.parent] if kind == '"' else []
+            search_path += include_directories + system_include_directories
+
+            # Headers that can't be found are kept by name, so that they still show up in the graph
+            included = next(((directory / name).resolve() for directory in search_path if (directory / name).is_file()), f"<{name}>" if kind == "<" else f'"{name}"')
+
+            if included not in graph[path]:
+                graph[path].append(included)
+                pending.append(included)
+
+    return graph, lines
+
+def find_reachable(graph, start):
+    reachable = {start}
+    pending = [start]
+
+    while pending:
+        for included in graph.get(pending.pop(), []):
+            if included not in reachable:
+                reachable.add(included)
+                pending.append(included)
+
+    return reachable
+
+def find_include_cycles(graph):
+    # Tarjan's strongly connected components, without recursion so that deep include chains can't overflow the stack
+    indexes = {}
+    lowest = {}
+    stack = []
+    on_stack = set()
+    cycles = []
+
+    for root in graph:
+        if root in indexes:
+            continue
+
+        indexes[root] = lowest[root] = len(indexes)
+        stack.append(root)
+        on_stack.add(root)
+        work = [(root, iter(graph[root]))]
+
+        while work:
+            node, successors = work[-1]
+            successor = next(successors, None)
+
+            if successor is not None:
+                if successor not in indexes:
+                    indexes[successor] = lowest[successor] = len(indexes)
+                    stack.append(successor)
+                    on_stack.add(successor)
+                    work.append((successor, iter(graph.get(successor, []))))
+                elif successor in on_stack:
+                    lowest[node] = min(lowest[node], indexes[successor])
+
+                continue
+
+            work.pop()
+
+            if work:
+                lowest[work[-1][0]] = min(lowest[work[-1][0]], lowest[node])
+
+            if lowest[node] == indexes[node]:
+                component = []
+
+                while True:
+                    member = stack.pop()
+                    on_stack.remove(member)
+                    component.append(member)
+
+                    if member == node:
+                        break
+
+                if len(component) > 1 or node in graph.get(node, []):
+                    cycles.append(component)
+
+    return cycles
+
+def find_cycle_path(graph, cycle):
+    # Walk from the first file back to itself through the other files in the cycle, so that it can be shown as a chain of includes
+    start = cycle[0]
+    previous = {}
+    pending = [start]
+
+    while pending:
+        path = pending.pop(0)
+
+        for included in graph[path]:
+            if included == start:
+                chain = [path]
+
+                while chain[-1] != start:
+                    chain.append(previous[chain[-1]])
+
+                return [*reversed(chain), start]
+
+            if included in cycle and included not in previous:
+                previous[included] = path
+                pending.append(included)
+
+    return [*cycle, start]
+
+def include_name(path, system_include_directories):
+    if isinstance(path, str):
+        return path
+
+    if Path.cwd().resolve() in path.parents:
+        return path.relative_to(Path.cwd().resolve()).as_posix()
+
+    # External headers are named the way they are included
+    for directory in system_include_directories:
+        if directory in path.parents:
+            return f"<{path.relative_to(directory).as_posix()}>"
+
+    return path.as_posix()
+
+@cli.command()
+@click.option("--deps", is_flag=True, help="Work out which translation units reach each header from the compiler's dependency files in `build/debug`, rather than from the scanned graph.")
+@click.option("--top", type=click.IntRange(min=1), default=20, help="The number of headers to show in each table.")
+@click.option("--dot", type=click.Path(dir_okay=False, writable=True), help="Write the project's include graph to this file in Graphviz's DOT format.")
+@click.option("--json", "json_file", type=click.Path(dir_okay=False, writable=True), help="Write the include graph and the costs of each file to this file as JSON.")
+def includes(deps, top, dot, json_file):
+    project_files = sorted(path.resolve() for directory in ["src", "tests"] if Path(directory).is_dir() for path in Path(directory).rglob("*") if path.suffix in SOURCE_EXTENSIONS + HEADER_EXTENSIONS)
+
+    if not project_files:
+        error("no source files exist in `./src` or `./tests`")
+        sys.exit(1)
+
+    system_include_directories = find_system_include_directories()
+    graph, lines = scan_includes(project_files, find_include_directories(), system_include_directories)
+    translation_units = [path for path in project_files if path.suffix in SOURCE_EXTENSIONS]
+
+    # What each translation unit pulls in, either as scanned or as the compiler actually saw it
+    if deps:
+        dependencies = read_dependencies(Path("build/debug"), include_external=True)
+
+        if not dependencies:
+            error("could not find any dependency files in `build/debug` (run `streamline build` first)")
+            sys.exit(1)
+
+        reached_by = {source: files for source, files in dependencies.items() if source in translation_units}
+
+        for path in set().union(*reached_by.values()) - set(lines):
+            lines[path] = path.read_text(encoding="utf-8", errors="replace").count("\n") if path.is_file() else 0
+    else:
+        reached_by = {source: find_reachable(graph, source) for source in translation_units}
+
+    # Precompiled headers are included into every translation unit by CMake rather than with an `#include`
+    for precompiled_header in find_precompiled_headers():
+        if precompiled_header in graph:
+            for files in reached_by.values():
+                files |= find_reachable(graph, precompiled_header)
+
+    transitive_lines = {path: sum(lines[included] for included in find_reachable(graph, path)) for path in graph if not isinstance(path, str)}
+    compiled_lines = {source: sum(lines[path] for path in files) for source, files in reached_by.items()}
+    headers = [path for path in project_files if path.suffix in HEADER_EXTENSIONS]
+    external_headers = {included for path in project_files for included in graph[path] if included not in project_files}
+    costs = {}
+
+    for path in headers + sorted(external_headers, key=str):
+        sources = [source for source, files in reached_by.items() if path in files]
+        costs[path] = {"lines": lines[path], "transitive_lines": transitive_lines.get(path, 0), "translation_units": len(sources), "rebuilt_lines": sum(compiled_lines[source] for source in sources)}
+
+    name = lambda path: include_name(path, system_include_directories)
+
+    info(f"scanned {len(project_files)} project files and {len(graph) - len(project_files)} external headers, and {len(reached_by)} translation units compile {sum(compiled_lines.values()):,} lines between them")
+
+    # Touching a header rebuilds every translation unit that reaches it, which is where forward declarations and PIMPL pay off
+    if headers:
+        click.echo()
+        click.echo(f"{'header':<40}{'lines':>10}{'includes':>12}{'rebuilds':>10}{'rebuilt lines':>16}")
+
+        for path in sorted(headers, key=lambda path: (-costs[path]["rebuilt_lines"], name(path)))[:top]:
+            cost = costs[path]
+            click.echo(f"{name(path):<40}{cost['lines']:>10,}{cost['transitive_lines']:>12,}{cost['translation_units']:>10}{cost['rebuilt_lines']:>16,}")
+
+    if external_headers:
+        click.echo()
+        click.echo(f"{'external header':<40}{'includes':>12}{'reached by':>12}")
+
+        for path in sorted(external_headers, key=lambda path: (-costs[path]["transitive_lines"] * costs[path]["translation_units"], name(path)))[:top]:
+            cost = costs[path]
+            click.echo(f"{name(path):<40}{cost['transitive_lines']:>12,}{cost['translation_units']:>12}")
+
+    cycles = [cycle for cycle in find_include_cycles(graph) if any(path in project_files for path in cycle)]
+
+    click.echo()
+
+    if cycles:
+        error(f"found {len(cycles)} include cycle(s)")
+
+        for cycle in cycles:
+            click.echo(f"  {' -> '.join(name(path) for path in find_cycle_path(graph, cycle))}")
+    else:
+        success("no include cycles")
+
+    if dot is not None:
+        # Only the project's files and the external headers they include directly, since the whole graph is too big to read
+        dot_lines = ["digraph includes {", "    rankdir=LR;", "    node [shape=box];"]
+
+        # Headers that couldn't be found are named with their quotes, which have to be escaped
+        quote = lambda text: '"' + text.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") + '"'
+
+        for path in project_files:
+            label = name(path) + "\n" + f"rebuilds {costs[path]['translation_units']}" if path in costs else None
+            attributes = f"label={quote(label)}" if label is not None else "style=filled, fillcolor=lightgrey"
+            dot_lines.append(f'    {quote(name(path))} [{attributes}];')
+
+        for path in sorted(external_headers, key=str):
+            dot_lines.append(f'    {quote(name(path))} [style=dashed];')
+
+        for path in project_files:
+            for included in graph[path]:
+                dot_lines.append(f'    {quote(name(path))} -> {quote(name(included))};')
+
+        dot_lines.append("}")
+        Path(dot).write_text("\n".join(dot_lines) + "\n", encoding="utf-8")
+
+        success(f"wrote the include graph to `{dot}`")
+
+    if json_file is not None:
+        files = {name(path): {"lines": lines[path], "includes": [name(included) for included in graph[path]], **costs.get(path, {})} for path in graph}
+
+        for source, compiled in compiled_lines.items():
+            files[name(source)]["compiled_lines"] = compiled
+        Path(json_file).write_text(json.dumps({"files": files, "cycles": [[name(path) for path in find_cycle_path(graph, cycle)] for cycle in cycles]}, indent=4), encoding="utf-8")
+
+        success(f"wrote the include graph to `{json_file}`")
+
+def read_log():
+    if not log_file().exists():
+        return []
+
+    records = []
+
+    for line in log_file().read_text(encoding="utf-8").splitlines():
+        # Skip lines left incomplete by an interrupted write
+        try:
+            records.append(json.loads(line))
+        except json.JSONDecodeError:
+            continue
+
+    return records
+
+def format_duration(seconds):
+    if seconds is None:
+        return "-"
+
+    if seconds < 60:
+        return f"{seconds:.2f}s"
+
+    return f"{int(seconds // 60)}m{seconds % 60:04.1f}s"
+
+def sparkline(values):
+    bars = "▁▂▃▄▅▆▇█"
+    highest = max(values)
+
+    if highest == 0:
+        return bars[0] * len(values)
+
+    return "".join(bars[round(value / highest * (len(bars) - 1))] for value in values)
+
+def mean(values):
+    values = [value for value in values if value is not None]
+
+    if not values:
+        return None
+
+    return sum(values) / len(values)
+
+@cli.command()
+@click.option("--last", type=click.IntRange(min=2), default=20, help="The number of recent runs of each phase to consider.")
+def stats(last):
+    records = read_log()
+
+    if not records:
+        error(f"no runs have been recorded in `{log_file()}` yet")
+        return
+
+    # Group the recent runs by phase, keeping them in the order they happened
+    phases = {}
+
+    for record in records:
+        phases.setdefault(record["phase"], []).append(record)
+
+    phases = {phase: runs[-last:] for phase, runs in phases.items()}
+
+    info(f"the last {last} runs of each phase")
+    click.echo(f"{'phase':<16}{'runs':>6}{'last':>10}{'mean':>10}{'best':>10}{'worst':>10}{'failed':>8}  trend")
+
+    for phase, runs in sorted(phases.items(), key=lambda item: -mean([run["duration"] for run in item[1]])):
+        durations = [run["duration"] for run in runs]
+        failed = sum(1 for run in runs if run["exit_code"] != 0)
+
+        click.echo(f"{phase:<16}{len(runs):>6}{format_duration(durations[-1]):>10}{format_duration(mean(durations)):>10}{format_duration(min(durations)):>10}{format_duration(max(durations)):>10}{failed:>8}  {sparkline(durations)}")
+
+    # Break the builds down into the steps that make them up
+    builds = {phase: runs for phase, runs in phases.items() if "configure" in runs[-1]}
+
+    if builds:
+        click.echo()
+        info("where the build time goes (means)")
+        click.echo(f"{'phase':<16}{'configure':>11}{'compile':>10}{'link':>10}{'TUs':>7}")
+
+        for phase, runs in builds.items():
+            translation_units = mean([run.get("translation_units") for run in runs])
+            click.echo(f"{phase:<16}{format_duration(mean([run.get('configure') for run in runs])):>11}{format_duration(mean([run.get('compile') for run in runs])):>10}{format_duration(mean([run.get('link') for run in runs])):>10}{translation_units or 0:>7.1f}")
+
+    # Compare the latest run of each phase with the median of the runs before it
+    regressions = []
+
+    for phase, runs in phases.items():
+        if len(runs) < 3 or runs[-1]["exit_code"] != 0:
+            continue
+
+        previous = sorted(run["duration"] for run in runs[:-1] if run["exit_code"] == 0)
+
+        if not previous:
+            continue
+
+        median = previous[len(previous) // 2]
+        latest = runs[-1]["duration"]
+
+        if latest > median * 1.25 and latest - median > 0.25:
+            regressions.append(f"{phase} took {format_duration(latest)}, up from a median of {format_duration(median)}")
+
+    click.echo()
+
+    if regressions:
+        for regression in regressions:
+            error(regression)
+    else:
+        success("no regressions in the latest runs")
+
+@cli.group()
+def cache():
+    pass
+
+def find_compiler_cache():
+    # The compiler cache that CMake found is recorded in the cache of every build tree
+    for cmake_cache in sorted(Path("build").glob("*/CMakeCache.txt")):
+        for line in cmake_cache.read_text(encoding="utf-8", errors="replace").splitlines():
+            if line.startswith("COMPILER_CACHE:") and not line.endswith("-NOTFOUND"):
+                return Path(line.split("=", 1)[1])
+
+    return None
+
+def print_hit_rate(hits, misses):
+    total = hits + misses
+
+    if total == 0:
+        info("no compilations have been recorded yet")
+        return
+
+    click.echo(f"hits:     {hits}")
+    click.echo(f"misses:   {misses}")
+    click.echo(f"hit rate: {hits / total:.1%}")
+
+@cache.command("stats")
+def cache_stats():
+    import subprocess
+
+    compiler_cache = find_compiler_cache()
+
+    if compiler_cache is None:
+        error("no compiler cache is in use (run `streamline build` first, or pass `--compiler-cache` to `init`)")
+        return
+
+    if compiler_cache.stem == "ccache":
+        # The build scripts point `CCACHE_STATSLOG` at this file, so it only holds this project's compilations
+        stats_log = Path("build") / "ccache_stats.log"
+
+        if not stats_log.exists():
+            info("no compilations have been recorded yet")
+            return
+
+        counters = stats_log.read_text(encoding="utf-8").split()
+        hits = counters.count("direct_cache_hit") + counters.count("preprocessed_cache_hit")
+        misses = counters.count("cache_miss")
+
+        info(f"ccache statistics for this project ({compiler_cache})")
+        print_hit_rate(hits, misses)
+    else:
+        # sccache only keeps statistics for its server as a whole
+        output = subprocess.run([compiler_cache, "--show-stats", "--stats-format", "json"], capture_output=True, text=True)
+
+        if output.returncode != 0:
+            error(f"could not read statistics from `{compiler_cache}`")
+            return
+
+        statistics = json.loads(output.stdout)["stats"]
+        hits = sum(statistics["cache_hits"]["counts"].values())
+        misses = sum(statistics["cache_misses"]["counts"].values())
+
+        info(f"sccache statistics for the running server ({compiler_cache})")
+        print_hit_rate(hits, misses)
+
+@cli.group()
+def deps():
+    pass
+
+def find_project_edition():
+    # The edition is written into the target properties by `init`
+    src_cmakelists = Path("src") / "CMakeLists.txt"
+
+    if src_cmakelists.exists():
+        match = re.search(r"CXX_STANDARD (\d+)", src_cmakelists.read_text(encoding="utf-8"))
+
+        if match:
+            return match.group(1)
+
+    return None
+
+def read_compiler_identity(build_directory):
+    # CMake records the compiler it detected under `CMakeFiles/<version>/CMakeCXXCompiler.cmake`
+    for compiler_file in Path(build_directory).glob("CMakeFiles/*/CMakeCXXCompiler.cmake"):
+        contents = compiler_file.read_text(encoding="utf-8")
+        compiler_id = re.search(r'set\(CMAKE_CXX_COMPILER_ID "(.*)"\)', contents)
+        compiler_version = re.search(r'set\(CMAKE_CXX_COMPILER_VERSION "(.*)"\)', contents)
+
+        if compiler_id and compiler_version:
+            return f"{compiler_id.group(1)}-{compiler_version.group(1)}"
+
+    return None
+
+def prefetch_dependency(name, editions, jobs):
+    import shutil
+    import subprocess
+    import urllib.request
+    import zipfile
+
+    dependency = DEPENDENCIES[name]
+    dependency_directory = find_dependency_cache() / name
+    archive = dependency_directory / f"{dependency['revision']}.zip"
+    source_directory = dependency_directory / f"{dependency['revision']}-src"
+
+    dependency_directory.mkdir(parents=True, exist_ok=True)
+
+    # Download the pinned archive (written to a temporary file first so an interrupted download isn't cached)
+    if not archive.exists():
+        info(f"downloading {name} from {dependency['url']}")
+
+        try:
+            urllib.request.urlretrieve(dependency["url"], archive.with_suffix(".part"))
+        except OSError as e:
+            error(f"could not download {name}: {e}")
+            return False
+
+        archive.with_suffix(".part").replace(archive)
+
+    # Extract the sources, which are inside a single top-level directory in the archive
+    if not source_directory.exists():
+        extract_directory = dependency_directory / f"{dependency['revision']}-extract"
+        shutil.rmtree(extract_directory, ignore_errors=True)
+
+        with zipfile.ZipFile(archive) as zip_file:
+            zip_file.extractall(extract_directory)
+
+        next(extract_directory.iterdir()).replace(source_directory)
+        shutil.rmtree(extract_directory)
+
+    # Build and install it once per compiler and edition
+    for edition in editions:
+        build_directory = dependency_directory / f"{dependency['revision']}-build" / f"cxx{edition}"
+        options = [f"-D{option}={value}" for option, value in dependency["options"].items()]
+
+        exit_code = subprocess.call(["cmake", "-S", source_directory, "-B", build_directory, "-DCMAKE_BUILD_TYPE=Release", f"-DCMAKE_CXX_STANDARD={edition}", *options], stdout=subprocess.DEVNULL)
+        compiler_identity = read_compiler_identity(build_directory)
+
+        if exit_code != 0 or compiler_identity is None:
+            error(f"could not configure {name} for C++{edition}")
+            return False
+
+        prefix = dependency_directory / dependency["revision"] / f"{compiler_identity}-cxx{edition}"
+
+        if prefix.exists():
+            info(f"{name} is already cached for {compiler_identity} and C++{edition}")
+            continue
+
+        info(f"building {name} for {compiler_identity} and C++{edition}")
+
+        exit_code = subprocess.call(["cmake", "--build", build_directory, "--parallel", str(jobs or os.cpu_count() or 1)], stdout=subprocess.DEVNULL)
+
+        if exit_code == 0:
+            exit_code = subprocess.call(["cmake", "--install", build_directory, "--prefix", prefix], stdout=subprocess.DEVNULL)
+
+        if exit_code != 0:
+            shutil.rmtree(prefix, ignore_errors=True)
+            error(f"could not build {name} for C++{edition}")
+            return False
+
+    return True
+
+@deps.command()
+@click.option("--edition", "editions", type=click.Choice(["98", "11", "14", "17", "20", "23", "26"]), multiple=True, help="An edition to prebuild the dependencies for (defaults to the project's edition). Can be given more than once.")
+@jobs_option
+def prefetch(editions, jobs):
+    if not editions:
+        editions = [find_project_edition() or "17"]
+
+    # Only fetch what the project uses, or everything when run outside a project
+    names = [name for name, directory in [("googletest", "tests"), ("benchmark", "bench")] if (Path(directory) / "CMakeLists.txt").exists()]
+
+    for name in names or DEPENDENCIES:
+        if not prefetch_dependency(name, editions, jobs):
+            sys.exit(1)
+
+    success(f"cached dependencies in `{find_dependency_cache()}`")
+
+def find_projects(root):
+    # A project has `streamline.toml`, or the scripts that `init` generated before it did
+    projects = []
+
+    for directory, subdirectories, files in os.walk(root):
+        directory = Path(directory)
+
+        if "streamline.toml" in files or (directory / "tools" / "build_debug.py").exists():
+            projects.append(directory)
+            subdirectories.clear()
+            continue
+
+        subdirectories[:] = sorted(name for name in subdirectories if not name.startswith(".") and name != "build")
+
+    return sorted(projects)
+
+def project_fingerprint(project):
+    import hashlib
+
+    # Everything in the project except what building it produces
+    digest = hashlib.sha256()
+
+    for directory, subdirectories, files in os.walk(project):
+        is_root = Path(directory) == project
+        subdirectories[:] = sorted(name for name in subdirectories if not name.startswith(".") and not (is_root and name in ["build", "docs"]))
+
+        for name in sorted(files):
+            path = Path(directory) / name
+            digest.update(str(path.relative_to(project)).encode())
+            digest.update(path.read_bytes())
+
+    return digest.hexdigest()
+
+@cli.command()
+@click.argument("action", type=click.Choice(["build", "test"]), default="test")
+@click.argument("root", type=click.Path(exists=True, file_okay=False, path_type=Path), default=".")
+@click.option("--parallel", type=click.IntRange(min=1), help="The number of projects to work on at once (defaults to the number of cores).")
+@click.option("-j", "--jobs", type=click.IntRange(min=1), help="The number of parallel build jobs for each project (defaults to the cores divided between the projects).")
+@click.option("--force", is_flag=True, help="Include the projects that are unchanged since their last successful run.")
+def workspace(action, root, parallel, jobs, force):
+    import concurrent.futures
+    import subprocess
+    import threading
+
+    projects = find_projects(root)
+
+    if not projects:
+        error(f"could not find any Streamline projects under `{root}`")
+        sys.exit(1)
+
+    cores = os.cpu_count() or 1
+    parallel = min(parallel or cores, len(projects))
+    jobs = jobs or max(1, cores // parallel)
+
+    # Share one compiler cache and one dependency cache, with paths under the root made relative so that projects can reuse each other's results
+    environment = dict(os.environ)
+    environment.setdefault("CCACHE_BASEDIR", str(root.resolve()))
+    environment.setdefault("STREAMLINE_CACHE_DIR", str(find_dependency_cache().resolve()))
+
+    lock = threading.Lock()
+    finished = 0
+
+    def process(project):
+        nonlocal finished
+
+        state_file = project / "build" / "streamline_workspace.json"
+        log = project / "build" / "streamline_workspace.log"
+        fingerprint = project_fingerprint(project)
+
+        try:
+            state = json.loads(state_file.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            state = {}
+
+        result = {"status": "ok", "durations": {}}
+
+        if not force and state.get(action) == fingerprint:
+            result["status"] = "skipped"
+        else:
+            steps = ["build", "test"] if action == "test" and has_tests(project) else ["build"]
+            log.parent.mkdir(exist_ok=True)
+
+            with log.open("w", encoding="utf-8") as f:
+                for step in steps:
+                    start = time.time()
+                    exit_code = subprocess.call([sys.executable, ENTRY_POINT.resolve(), step, *jobs_arguments(jobs)], cwd=project, env=environment, stdout=f, stderr=subprocess.STDOUT)
+                    result["durations"][step] = time.time() - start
+
+                    if exit_code != 0:
+                        result["status"] = "failed"
+                        break
+
+            # A successful test run also means that the project builds. The fingerprint is taken again, since building can rewrite files such as `sources.cmake`
+            if result["status"] == "ok":
+                fingerprint = project_fingerprint(project)
+                state[action] = fingerprint
+
+                if action == "test":
+                    state["build"] = fingerprint
+
+                state_file.write_text(json.dumps(state), encoding="utf-8")
+
+        with lock:
+            finished += 1
+            colour = {"ok": "green", "skipped": None, "failed": "red"}[result["status"]]
+            click.echo(f"[{finished}/{len(projects)}] {project.relative_to(root)} " + click.style(result["status"], fg=colour))
+
+        return result
+
+    info(f"{action}ing {len(projects)} project(s), {parallel} at a time with -j {jobs} each")
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=parallel) as executor:
+        results = dict(zip(projects, executor.map(process, projects)))
+
+    click.echo()
+    info("results")
+
+    width = max(len(str(project.relative_to(root))) for project in projects)
+    click.echo(f"  {'project':<{width}}  {'status':<7}  {'build':>8}  {'test':>8}")
+
+    for project, result in results.items():
+        durations = result["durations"]
+        click.echo(f"  {str(project.relative_to(root)):<{width}}  {result['status']:<7}  {format_duration(durations.get('build')):>8}  {format_duration(durations.get('test')):>8}")
+
+    failures = [project for project, result in results.items() if result["status"] == "failed"]
+
+    for project in failures:
+        click.echo()
+        error(f"{project.relative_to(root)} failed, the end of `{project / 'build' / 'streamline_workspace.log'}` follows")
+        click.echo("\n".join((project / "build" / "streamline_workspace.log").read_text(encoding="utf-8", errors="replace").splitlines()[-15:]))
+
+    click.echo()
+
+    counts = {status: sum(1 for result in results.values() if result["status"] == status) for status in ["ok", "skipped", "failed"]}
+    summary = f"{counts['ok']} ok, {counts['skipped']} skipped, {counts['failed']} failed"
+
+    if failures:
+        error(summary)
+        sys.exit(1)
+
+    success(summary)
\ No newline at end of file